@@ -31,7 +31,7 @@ try:
     HAS_MODEL_MANAGER = True
 except ImportError:
     HAS_MODEL_MANAGER = False
-    KNOWN_MODELS = {}
+    KNOWN_MODELS = ()
 
 # ---------- Paths ----------
 ROOT = Path(__file__).resolve().parent
@@ -453,8 +453,8 @@ class ModelDownloadDialog(tk.Toplevel):
                  bg=THEME_SUCCESS, fg="#000", font=("Segoe UI", 10, "bold")).pack(pady=10)
         
         # Populate list
-        for name, info in KNOWN_MODELS.items():
-            self.download_listbox.insert("end", f"{name} ({info['size_mb']}MB)")
+        for spec in KNOWN_MODELS:
+            self.download_listbox.insert("end", f"{spec.name} ({spec.size_mb}MB)")
     
     def _refresh_local_models(self):
         """Refresh local models list."""
@@ -525,13 +525,11 @@ class ModelDownloadDialog(tk.Toplevel):
         if not sel:
             return
         
-        names = list(KNOWN_MODELS.keys())
-        if sel[0] < len(names):
-            name = names[sel[0]]
-            info = KNOWN_MODELS[name]
+        if sel[0] < len(KNOWN_MODELS):
+            spec = KNOWN_MODELS[sel[0]]
             self.detail_label.config(
-                text=f"Description: {info['description']}\n"
-                     f"Size: {info['size_mb']}MB | Min RAM: {info['min_ram_gb']}GB"
+                text=f"Description: {spec.description}\n"
+                     f"Size: {spec.size_mb}MB | Min RAM: {spec.min_ram_gb}GB"
             )
     
     def _download_model(self):
@@ -541,11 +539,10 @@ class ModelDownloadDialog(tk.Toplevel):
             messagebox.showwarning("Select Model", "Please select a model to download.")
             return
         
-        names = list(KNOWN_MODELS.keys())
-        if sel[0] >= len(names):
+        if sel[0] >= len(KNOWN_MODELS):
             return
         
-        model_name = names[sel[0]]
+        model_name = KNOWN_MODELS[sel[0]].name
         
         if not self.model_manager:
             messagebox.showerror("Error", "Model manager not available.")
@@ -133,9 +133,8 @@ class BathyPresident:
             "security": SecurityAgent(),
             "overseer": OverseerAgent(),
         }
-
-    def list_agents(self) -> List[Dict[str, str]]:
-        return [
+        # Advisor metadata is static, so build it once instead of per request.
+        self._agent_meta: List[Dict[str, str]] = [
             {
                 "name": a.cfg.name,
                 "role": a.cfg.role,
@@ -144,6 +143,10 @@ class BathyPresident:
             for a in self.advisors.values()
         ]
 
+    def list_agents(self) -> List[Dict[str, str]]:
+        """Return advisor metadata. The dicts are shared; treat them as read-only."""
+        return list(self._agent_meta)
+
     def _synthesize(self, message: str, proposals: List[AgentProposal]) -> str:
         """Use a second model pass to synthesize council proposals.
 
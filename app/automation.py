@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional
 
 from .config import ROOT, load_config
+from .json_utils import dumps, write_atomic
 from .agents.clerk import Clerk, ClerkResult
 from .logging_utils import get_logger
 
@@ -111,7 +112,7 @@ class AutomationEngine:
 
     def _save(self) -> None:
         data = {"tasks": [t.to_dict() for t in self._tasks.values()]}
-        TASKS_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        write_atomic(TASKS_PATH, dumps(data, indent=True))
 
     # --- Public API ----------------------------------------------------------
 
@@ -0,0 +1,43 @@
+"""Cheap wall-clock timestamps for hot logging paths."""
+import time
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+# (whole second, "YYYY-MM-DDTHH:MM:SS." for that second in local time).
+# Replaced as a single tuple so concurrent callers never see a torn pair.
+_second_cache: Tuple[Optional[int], str] = (None, "")
+# Same, in UTC, for utc_now_iso().
+_utc_second_cache: Tuple[Optional[int], str] = (None, "")
+
+
+def now_iso() -> str:
+    """Return the local time as an ISO 8601 string with microseconds.
+
+    Equivalent to ``datetime.now().isoformat(timespec="microseconds")``, but the
+    date/time part is formatted at most once per second and only the
+    microsecond suffix is rebuilt on each call.
+    """
+    global _second_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _second_cache
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%S.")
+        _second_cache = (second, prefix)
+    return prefix + "%06d" % ((now - second) * 1_000_000)
+
+
+def utc_now_iso(suffix: str = "+00:00") -> str:
+    """Return the UTC time as an ISO 8601 string with microseconds.
+
+    The default suffix matches ``datetime.now(timezone.utc).isoformat()``;
+    pass ``"Z"`` for the shorter form. Cached per second like now_iso().
+    """
+    global _utc_second_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _utc_second_cache
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.")
+        _utc_second_cache = (second, prefix)
+    return prefix + "%06d" % ((now - second) * 1_000_000) + suffix
@@ -1,9 +1,11 @@
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
-ROOT = Path(__file__).resolve().parents[1]
+# Runtime data (data/, logs/, memory/, models/) lives under ROOT. GOODBOY_ROOT
+# points it elsewhere, e.g. at a per-worker temp dir under pytest-xdist.
+ROOT = Path(os.environ.get("GOODBOY_ROOT") or Path(__file__).resolve().parents[1])
 DATA_DIR = ROOT / "data"
 CONFIG_PATH = DATA_DIR / "GoodBoy_config.json"
 
@@ -65,13 +67,30 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 }
 
 
+# ((st_mtime_ns, st_size), parsed config) from the last successful read.
+_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
+
 def load_config() -> Dict[str, Any]:
-    os.makedirs(DATA_DIR, exist_ok=True)
-    if not CONFIG_PATH.exists():
+    """Return the parsed config, re-reading the file only when it changes.
+
+    The result is shared between callers and must be treated as read-only.
+    """
+    global _cache
+    try:
+        st = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        os.makedirs(DATA_DIR, exist_ok=True)
         CONFIG_PATH.write_text(json.dumps(DEFAULT_CONFIG, indent=2))
         return DEFAULT_CONFIG.copy()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
     try:
-        return json.loads(CONFIG_PATH.read_text())
+        cfg = json.loads(CONFIG_PATH.read_text())
     except Exception:
         # fallback to default but do not overwrite user file
         return DEFAULT_CONFIG.copy()
+    _cache = (key, cfg)
+    return cfg
@@ -1,26 +1,35 @@
 """GoodBoy.AI Command Center - Gradio Web Dashboard."""
-import json
 import subprocess
+import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 import gradio as gr
 import httpx
 
-API_BASE = "http://127.0.0.1:8000"
 ROOT = Path(__file__).resolve().parents[1]
+# Started as a script (python app/dashboard.py), so put the package root on the path.
+sys.path.append(str(ROOT))
+from app.dashboard_common import ACLIENT, render_jsonl_tail, serve  # noqa: E402
+from app.json_utils import dumps  # noqa: E402
+
 DATA_DIR = ROOT / "data"
 MEMORY_DIR = ROOT / "memory"
 
+# API paths, relative to ACLIENT's base_url.
+_CHAT_PATH = "/chat"
+_MEMORY_SEARCH_PATH = "/memory/search"
+_JANITOR_PATH = "/janitor/run"
+_EVOLUTION_PATH = "/evolution/status"
+_AGENTS_PATH = "/agents"
 
-def call_api(endpoint: str, method: str = "GET", payload: Dict = None, timeout: int = 120) -> Dict[str, Any]:
+async def call_api(endpoint: str, method: str = "GET", payload: Dict = None) -> Dict[str, Any]:
     """Generic API caller with error handling."""
     try:
-        url = f"{API_BASE}{endpoint}"
         if method == "GET":
-            r = httpx.get(url, params=payload, timeout=timeout)
+            r = await ACLIENT.get(endpoint, params=payload)
         else:
-            r = httpx.post(url, json=payload, timeout=timeout)
+            r = await ACLIENT.post(endpoint, json=payload)
         r.raise_for_status()
         return r.json()
     except httpx.ConnectError:
@@ -29,58 +38,46 @@ def call_api(endpoint: str, method: str = "GET", payload: Dict = None, timeout:
         return {"error": str(e)}
 
 
-def call_chat(message: str, mode: str = "auto") -> Dict[str, Any]:
+async def call_chat(message: str, mode: str = "auto") -> Dict[str, Any]:
     """Send chat message to council."""
-    return call_api("/chat", "POST", {"message": message, "mode": mode})
+    return await call_api(_CHAT_PATH, "POST", {"message": message, "mode": mode})
 
 
-def call_memory(q: str) -> Dict[str, Any]:
+async def call_memory(q: str) -> Dict[str, Any]:
     """Search memory."""
-    return call_api(f"/memory/search?q={q}&k=5")
+    return await call_api(_MEMORY_SEARCH_PATH, payload={"q": q, "k": 5, "max_chars": 200})
 
 
-def call_janitor() -> Dict[str, Any]:
+async def call_janitor() -> Dict[str, Any]:
     """Run system health check."""
-    return call_api("/janitor/run", "POST")
+    return await call_api(_JANITOR_PATH, "POST")
 
 
-def call_evolution_status() -> Dict[str, Any]:
+async def call_evolution_status() -> Dict[str, Any]:
     """Get evolution status."""
-    return call_api("/evolution/status")
+    return await call_api(_EVOLUTION_PATH)
 
 
-def call_agents() -> Dict[str, Any]:
+async def call_agents() -> Dict[str, Any]:
     """Get agent list."""
-    return call_api("/agents")
+    return await call_api(_AGENTS_PATH)
 
 
-def load_jsonl_tail(filename: str, limit: int = 20) -> str:
-    """Load last N entries from a JSONL file."""
-    path = MEMORY_DIR / filename
-    if not path.exists():
-        return f"No data yet at {path}"
-    try:
-        lines = path.read_text(encoding="utf-8").splitlines()
-        tail = lines[-limit:]
-        out = []
-        for line in tail:
-            try:
-                obj = json.loads(line)
-                out.append(json.dumps(obj, ensure_ascii=False, indent=2))
-            except Exception:
-                out.append(line)
-        return "\n\n---\n\n".join(out)
-    except Exception as e:
-        return f"Error reading {path}: {e}"
+def load_jsonl_tail(filename: str, limit: int = 20, pretty: bool = True) -> str:
+    """Load last N entries from a JSONL file.
+    
+    With ``pretty=False`` the raw records are returned without being parsed.
+    """
+    return render_jsonl_tail(MEMORY_DIR / filename, limit, pretty)
 
 
 # Chat function
-def chat_fn(message: str, history: list, mode: str):
+async def chat_fn(message: str, history: list, mode: str):
     """Process chat message and return response."""
     if not message.strip():
         return history, "", mode
     
-    data = call_chat(message, mode=mode)
+    data = await call_chat(message, mode=mode)
     
     if "error" in data:
         bot_msg = f"Error: {data['error']}"
@@ -119,34 +116,33 @@ def chat_fn(message: str, history: list, mode: str):
     return history + [[f"You: {message}", bot_msg]], "", mode_used
 
 
-def memory_fn(query: str) -> str:
+async def memory_fn(query: str) -> str:
     """Search memory."""
     if not query.strip():
         return ""
-    res = call_memory(query)
+    res = await call_memory(query)
     if "error" in res:
         return f"Error: {res['error']}"
     results = res.get("results", [])
     if not results:
         return "No matching memories found."
-    return "\n\n".join([f"- {r.get('text', '')[:200]}..." for r in results])
+    return "\n\n".join([f"- {r.get('text', '')}{'...' if r.get('truncated') else ''}" for r in results])
 
 
-def janitor_fn() -> str:
-    """Run health check."""
-    rep = call_janitor()
-    return json.dumps(rep, indent=2)
+async def janitor_fn() -> Dict[str, Any]:
+    """Run health check; the report is shown as-is by a gr.JSON component."""
+    return await call_janitor()
 
 
-def evolution_fn() -> str:
+async def evolution_fn() -> str:
     """Get evolution status."""
-    status = call_evolution_status()
-    return json.dumps(status, indent=2)
+    status = await call_evolution_status()
+    return dumps(status, indent=True).decode("utf-8")
 
 
-def agents_fn() -> str:
+async def agents_fn() -> str:
     """Get agents info."""
-    data = call_agents()
+    data = await call_agents()
     if "error" in data:
         return f"Error: {data['error']}"
     
@@ -222,7 +218,7 @@ def build_interface() -> gr.Blocks:
         with gr.Tab("System Health"):
             gr.Markdown("## System Health Check\nRun diagnostics and cleanup.")
             health_btn = gr.Button("Run Health Check", variant="primary")
-            health_output = gr.Textbox(label="Health Report", lines=15)
+            health_output = gr.JSON(label="Health Report")
             health_btn.click(janitor_fn, outputs=health_output)
         
         gr.Markdown("---\n<center>GoodBoy.AI - Self-Aware - Self-Learning - All on Your Machine</center>")
@@ -231,5 +227,4 @@ def build_interface() -> gr.Blocks:
 
 
 if __name__ == "__main__":
-    demo = build_interface()
-    demo.launch(server_name="127.0.0.1", server_port=7860)
+    serve(build_interface())
@@ -0,0 +1,86 @@
+"""Shared plumbing for the Gradio dashboards (app/dashboard.py, ui/dashboard.py).
+
+Both dashboards call the local API through ACLIENT, render their log boxes
+with render_jsonl_tail(), and are started with serve(), which closes the
+client from the server's shutdown hook.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict
+
+import gradio as gr
+import httpx
+
+from .json_utils import dumps, loads, tail_lines
+
+API_BASE = "http://127.0.0.1:8000"
+
+# One pooled async client so concurrent handlers overlap their API calls.
+# Keep-alive connections to the local API are reused across clicks; timeouts
+# live here rather than on each call.
+ACLIENT = httpx.AsyncClient(
+    base_url=API_BASE,
+    limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+    timeout=httpx.Timeout(connect=5, read=120, write=30, pool=5),
+)
+
+# Rendered tails keyed on (path, mtime_ns, size, limit, pretty); a re-click on
+# an unchanged log is a dict lookup. Oldest entry is evicted first.
+_TAIL_CACHE: Dict[tuple, str] = {}
+_TAIL_CACHE_SIZE = 32
+
+
+def _remember_tail(key: tuple, text: str) -> str:
+    """Store a rendered tail, evicting the oldest entry when full."""
+    if len(_TAIL_CACHE) >= _TAIL_CACHE_SIZE:
+        _TAIL_CACHE.pop(next(iter(_TAIL_CACHE)), None)
+    _TAIL_CACHE[key] = text
+    return text
+
+
+def render_jsonl_tail(path: Path, limit: int = 20, pretty: bool = True) -> str:
+    """Last ``limit`` records of a JSONL log as text, separated by ``---``.
+
+    Records are re-indented; with ``pretty=False`` they are returned as
+    stored without being parsed.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return f"No data yet at {path}"
+    key = (str(path), st.st_mtime_ns, st.st_size, limit, pretty)
+    cached = _TAIL_CACHE.get(key)
+    if cached is not None:
+        return cached
+    try:
+        tail = tail_lines(path, limit, st.st_size)
+    except Exception as e:
+        return f"Error reading {path}: {e}"
+    if not pretty:
+        return _remember_tail(key, "\n\n---\n\n".join(line.decode("utf-8", errors="replace") for line in tail))
+    out = []
+    for line in tail:
+        try:
+            out.append(dumps(loads(line), indent=True).decode("utf-8"))
+        except Exception:
+            out.append(line.decode("utf-8", errors="replace"))
+    return _remember_tail(key, "\n\n---\n\n".join(out))
+
+
+async def close_client() -> None:
+    """Close ACLIENT on the server's event loop, the one its connections belong to."""
+    await ACLIENT.aclose()
+
+
+def serve(demo: gr.Blocks, host: str = "127.0.0.1", port: int = 7860) -> None:
+    """Serve ``demo`` with uvicorn until interrupted.
+
+    The Blocks app is mounted on a FastAPI app rather than started with
+    demo.launch() so that close_client runs as its shutdown hook.
+    """
+    import uvicorn
+    from fastapi import FastAPI
+
+    server = FastAPI(on_shutdown=[close_client])
+    uvicorn.run(gr.mount_gradio_app(server, demo, path="/"), host=host, port=port)
@@ -0,0 +1,110 @@
+"""Launcher diagnostics with a remembered dependency check.
+
+Importing the server dependencies is the slow part of a cold launch, so a
+passing check is recorded in logs/last_diag.json under a signature of the
+interpreter version, the mtimes of requirements.txt and app/, and the mtimes
+of the site-packages directories (which change whenever pip installs or
+removes a distribution). The check is only repeated when that signature
+changes.
+
+The dependency tables here are shared by start_goodboy.py and
+scripts/verify_installation.py.
+
+Usage:
+    signature = environment_signature()
+    if not dependencies_known_ok(signature):
+        if not missing_modules(REQUIRED_MODULES):
+            remember_dependencies_ok(signature)
+"""
+import hashlib
+import os
+import site
+import sys
+import sysconfig
+from importlib.util import find_spec
+from typing import Iterable, List
+
+from .config import ROOT
+from .json_utils import dumps, loads, write_atomic
+
+# Modules the launcher needs before it can start the server and UI.
+REQUIRED_MODULES = ("fastapi", "uvicorn", "gpt4all")
+
+# (module, display name) pairs reported by verify_installation.
+CORE_DEPENDENCIES = (
+    ("fastapi", "FastAPI"),
+    ("uvicorn", "Uvicorn"),
+    ("pydantic", "Pydantic"),
+    ("httpx", "HTTPX"),
+    ("gradio", "Gradio"),
+)
+OPTIONAL_DEPENDENCIES = (
+    ("gpt4all", "GPT4All (for local models)"),
+    ("chromadb", "ChromaDB (for vector search)"),
+    ("pypdf", "PyPDF (for PDF parsing)"),
+)
+
+DIAG_CACHE_PATH = ROOT / "logs" / "last_diag.json"
+
+
+def missing_modules(names: Iterable[str]) -> List[str]:
+    """Names whose package cannot be found.
+
+    find_spec only locates each package; none of their top-level code runs.
+    """
+    return [name for name in names if find_spec(name) is None]
+
+
+def _site_dirs() -> List[str]:
+    """Directories pip installs into for this interpreter."""
+    paths = sysconfig.get_paths()
+    dirs = {paths["purelib"], paths["platlib"]}
+    if site.ENABLE_USER_SITE:
+        dirs.add(site.getusersitepackages())
+    return sorted(dirs)
+
+
+def environment_signature() -> str:
+    """Hash the inputs that decide whether installed dependencies can change.
+
+    Returns "" when requirements.txt or app/ cannot be stat'ed, which never
+    matches a recorded result.
+    """
+    try:
+        parts = [
+            sys.version,
+            os.stat(ROOT / "requirements.txt").st_mtime_ns,
+            os.stat(ROOT / "app").st_mtime_ns,
+        ]
+    except OSError:
+        return ""
+    # Installing, upgrading or removing a package adds or deletes its
+    # *.dist-info entry, which bumps the directory's mtime.
+    for path in _site_dirs():
+        try:
+            parts.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            parts.append(None)
+    return hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=16).hexdigest()
+
+
+def dependencies_known_ok(signature: str) -> bool:
+    """True if the dependency check last passed under the same signature."""
+    if not signature:
+        return False
+    try:
+        cached = loads(DIAG_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return False
+    return cached.get("sig") == signature and cached.get("ok") is True
+
+
+def remember_dependencies_ok(signature: str) -> None:
+    """Record a passing dependency check; failures are never cached."""
+    if not signature:
+        return
+    try:
+        DIAG_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(DIAG_CACHE_PATH, dumps({"sig": signature, "ok": True}))
+    except OSError:
+        pass
@@ -0,0 +1,176 @@
+"""JSON helpers for GoodBoy.AI's JSON/JSONL stores.
+
+orjson is used when it is installed; otherwise everything falls back to the
+standard library, so callers get the faster codec without a hard dependency.
+
+Usage:
+    from .json_utils import dumps_line, loads
+    with path.open("ab") as f:
+        f.write(dumps_line(entry))
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+try:  # Optional fast path
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional
+    orjson = None  # type: ignore
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document (or a single JSONL line) from str or bytes."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes, optionally indented by 2 spaces."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Serialize ``obj`` as one JSONL record: UTF-8 bytes ending in a newline."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def write_atomic(path: Union[str, Path], data: bytes, fsync: bool = False) -> None:
+    """Replace ``path`` with ``data`` via a sibling temp file and os.replace.
+
+    Readers see the old or the new contents, never a partial write. The data
+    is left to the page cache unless ``fsync`` is set (shutdown paths).
+    """
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def tail_jsonl(path: Union[str, Path], limit: int, max_bytes: int = 64 * 1024) -> List[Any]:
+    """Return up to the last ``limit`` records of a JSONL file.
+
+    Only the final ``max_bytes`` of the file are read, so the cost does not
+    grow with the file; fewer records come back if they do not fit.
+    """
+
+    try:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            start = max(0, size - max_bytes)
+            f.seek(start)
+            lines = f.read().split(b"\n")
+    except FileNotFoundError:
+        return []
+    if start:
+        lines = lines[1:]  # first line is likely cut mid-record
+    records: List[Any] = []
+    for line in reversed(lines):
+        if len(records) >= limit:
+            break
+        if not line.strip():
+            continue
+        try:
+            records.append(loads(line))
+        except ValueError:
+            continue
+    records.reverse()
+    return records
+
+
+def _tail_start(f, size: int, limit: int, block: int = 8192) -> int:
+    """Offset from which the last ``limit`` complete lines can be read forwards.
+
+    Scans backwards in fixed-size blocks. One extra newline guarantees a
+    partial first line is pushed out by complete ones.
+    """
+
+    pos = size
+    newlines = 0
+    while pos > 0 and newlines <= limit:
+        step = min(block, pos)
+        pos -= step
+        f.seek(pos)
+        newlines += f.read(step).count(b"\n")
+    return pos
+
+
+# Per (path, limit): (offset just past the last complete line read, those
+# lines). Appended bytes are all a later tail_lines call has to read.
+_CURSOR: Dict[Tuple[str, int], Tuple[int, deque]] = {}
+
+
+def tail_lines(path: Union[str, Path], limit: int, size: int) -> List[bytes]:
+    """Return the last ``limit`` raw lines of a ``size``-byte file.
+
+    Unlike tail_jsonl this keeps a cursor per (path, limit), so a file that
+    only grew since the last call costs a read of the new bytes. A file that
+    shrank (truncated or rotated) is scanned again from its end.
+    """
+
+    key = (str(path), limit)
+    cursor = _CURSOR.get(key)
+    if cursor is not None and cursor[0] == size:
+        return list(cursor[1])
+    with open(path, "rb") as f:
+        if cursor is None or size < cursor[0]:
+            offset, lines = _tail_start(f, size, limit), deque(maxlen=limit)
+        else:
+            # Copy so a concurrent reader of the same file never sees a half-extended deque.
+            offset, lines = cursor[0], deque(cursor[1], maxlen=limit)
+        f.seek(offset)
+        data = f.read(size - offset)
+    end = data.rfind(b"\n") + 1
+    lines.extend(data[:end].splitlines())
+    _CURSOR[key] = (offset + end, lines)
+    # A line still being written is returned but not committed to the cursor.
+    partial = data[end:]
+    return (list(lines) + [partial])[-limit:] if partial else list(lines)
+
+
+def iter_jsonl(path: Union[str, Path]) -> Iterator[Any]:
+    """Yield records from a JSONL file in order, skipping blank or corrupt lines.
+
+    The file is memory-mapped and split on newlines in place, so lines are
+    handed to the parser without going through a buffered file object.
+    Missing or empty files yield nothing.
+    """
+
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start, end = 0, len(mm)
+            while start < end:
+                nl = mm.find(b"\n", start)
+                if nl == -1:
+                    nl = end
+                line = mm[start:nl]
+                start = nl + 1
+                if not line.strip():
+                    continue
+                try:
+                    yield loads(line)
+                except ValueError:
+                    continue
@@ -0,0 +1,107 @@
+"""Batched background writer for append-only JSONL logs.
+
+Request-path code calls `append(path, record)`, which only serializes the
+record into an in-memory buffer. A single daemon thread writes each file's
+buffered records with one open/write every FLUSH_INTERVAL seconds, or sooner
+when a buffer grows past MAX_BUFFER_BYTES. Pending records are flushed at
+interpreter exit.
+
+Usage:
+    from .jsonl_writer import get_writer
+    get_writer().append(path, {"kind": "note"})
+"""
+from __future__ import annotations
+
+import atexit
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .json_utils import dumps_line
+from .logging_utils import get_logger
+
+log = get_logger(__name__)
+
+PathLike = Union[str, Path]
+
+
+class JsonlWriter:
+    FLUSH_INTERVAL = 0.05  # seconds
+    MAX_BUFFER_BYTES = 64 * 1024
+
+    def __init__(self) -> None:
+        self._buffers: Dict[Path, List[bytes]] = {}
+        self._sizes: Dict[Path, int] = {}
+        # _lock guards the buffers; _io_lock serializes writes so a file's
+        # batches always land in the order they were taken.
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, path: PathLike, record: Any) -> None:
+        """Queue one record for `path`; it reaches disk on the next flush."""
+
+        line = dumps_line(record)
+        key = Path(path)
+        with self._lock:
+            self._buffers.setdefault(key, []).append(line)
+            size = self._sizes.get(key, 0) + len(line)
+            self._sizes[key] = size
+        if size >= self.MAX_BUFFER_BYTES:
+            self._wake.set()
+
+    def flush(self, path: Optional[PathLike] = None) -> None:
+        """Write buffered records now, for one file or for all of them."""
+
+        with self._io_lock:
+            with self._lock:
+                if path is None:
+                    pending = self._buffers
+                    self._buffers = {}
+                    self._sizes = {}
+                else:
+                    key = Path(path)
+                    chunks = self._buffers.pop(key, None)
+                    self._sizes.pop(key, None)
+                    pending = {key: chunks} if chunks else {}
+            for key, chunks in pending.items():
+                try:
+                    with open(key, "ab") as f:
+                        f.write(b"".join(chunks))
+                except Exception as e:  # pragma: no cover - filesystem errors
+                    log.error("Failed to append %d record(s) to %s: %s", len(chunks), key, e)
+
+    def close(self) -> None:
+        """Stop the background thread and flush whatever is still buffered."""
+
+        if not self._stopped:
+            self._stopped = True
+            self._wake.set()
+            self._thread.join(timeout=2)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+
+
+_writer: Optional[JsonlWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> JsonlWriter:
+    global _writer
+    # Lock-free once created; the lock only guards first construction.
+    writer = _writer
+    if writer is not None:
+        return writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = JsonlWriter()
+        return _writer
@@ -1,26 +1,24 @@
-import json
 from pathlib import Path
-from datetime import datetime
 from typing import List, Dict, Optional
 from collections import defaultdict
 
+from .clock import now_iso
+from .json_utils import iter_jsonl
+from .jsonl_writer import get_writer
+
 class LearningEngine:
     """Self-learning engine that discovers patterns and optimizes routing."""
     
     def __init__(self, memory_dir: Path):
         self.memory_dir = memory_dir
         self.patterns_file = memory_dir / "learned_patterns.jsonl"
+        self._writer = get_writer()
         self.patterns = self._load_patterns()
     
     def _load_patterns(self) -> List[Dict]:
         """Load learned patterns."""
-        patterns = []
-        if self.patterns_file.exists():
-            with open(self.patterns_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        patterns.append(json.loads(line))
-        return patterns
+        self._writer.flush(self.patterns_file)
+        return list(iter_jsonl(self.patterns_file))
     
     def learn_from_interaction(self, 
                                message: str, 
@@ -32,7 +30,7 @@ class LearningEngine:
         keywords = self._extract_keywords(message)
         
         pattern = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "keywords": keywords,
             "agents": agents_used,
             "quality": output_quality,
@@ -42,8 +40,7 @@ class LearningEngine:
         self.patterns.append(pattern)
         
         # Persist
-        with open(self.patterns_file, 'a') as f:
-            f.write(json.dumps(pattern) + '\n')
+        self._writer.append(self.patterns_file, pattern)
     
     def _extract_keywords(self, message: str, top_k: int = 5) -> List[str]:
         """Extract key terms from message."""
@@ -64,16 +61,17 @@ class LearningEngine:
             key = tuple(sorted(pattern["agents"]))
             agent_combos[key].append(pattern["quality"])
         
-        best_combo = max(
-            agent_combos.items(),
-            key=lambda x: sum(x[1]) / len(x[1])
+        # Average each combo once; max() then compares precomputed floats.
+        best_agents, best_avg, best_freq = max(
+            ((combo, sum(qs) / len(qs), len(qs)) for combo, qs in agent_combos.items()),
+            key=lambda x: x[1]
         )
         
         return {
-            "suggested_agents": list(best_combo[0]),
-            "avg_quality": sum(best_combo[1]) / len(best_combo[1]),
-            "frequency": len(best_combo[1]),
-            "timestamp": datetime.now().isoformat()
+            "suggested_agents": list(best_agents),
+            "avg_quality": best_avg,
+            "frequency": best_freq,
+            "timestamp": now_iso()
         }
     
     def get_routing_hint(self, keywords: List[str]) -> Optional[List[str]]:
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from .config import load_config
 from .agents.president import BathyPresident
 from .agents.clerk import Clerk
 from .agents.janitor import Janitor
-from .tools import TOOL_REGISTRY
-from .memory_backend import MemoryBackend
+from .tools import tools_prompt
+from .memory_backend import MemoryBackend, stable_id
 from .automation import AutomationEngine
 from .user_profile import get_store as get_user_profile_store
 from .teachings import get_store as get_teaching_store
@@ -23,6 +25,9 @@ class ChatRequest(BaseModel):
     agent_selector: Optional[str] = None
     max_tokens: Optional[int] = None
     mode: Optional[str] = None
+    # Answer with server-sent events: the reply as soon as the council is
+    # done, then the full response once suggested actions are planned.
+    stream: bool = False
 
 
 class ToolExecRequest(BaseModel):
@@ -116,9 +121,21 @@ async def brain_blueprint() -> Dict[str, Any]:
 
 
 @app.get("/memory/search")
-async def memory_search(q: str, k: int = 5) -> Dict[str, Any]:
-    """Search GoodBoy.AI long-term memory for relevant context."""
+async def memory_search(q: str, k: int = 5, max_chars: Optional[int] = None) -> Dict[str, Any]:
+    """Search GoodBoy.AI long-term memory for relevant context.
+
+    ``max_chars`` truncates each result's text before it is sent; results
+    that were cut carry ``"truncated": true``.
+    """
     results = memory_backend.search(q, k=k)
+    if max_chars is not None:
+        clipped = []
+        for r in results:
+            text = r.get("text", "")
+            if len(text) > max_chars:
+                r = {**r, "text": text[:max_chars], "truncated": True}
+            clipped.append(r)
+        results = clipped
     return {"query": q, "results": results}
 
 
@@ -135,7 +152,7 @@ async def teach(req: TeachRequest) -> TeachResponse:
     memory_backend.ingest_items(
         [
             {
-                "id": f"teaching-{hash((lesson.topic, lesson.created_at))}",
+                "id": stable_id("teaching", lesson.topic, lesson.created_at),
                 "text": f"Teaching topic: {lesson.topic}\nInstruction: {lesson.instruction}",
                 "meta": {"source": "teaching", "tags": lesson.tags},
             }
@@ -198,26 +215,11 @@ async def tools_exec(req: ToolExecRequest) -> ToolExecResponse:
     return ToolExecResponse(ok=result.ok, detail=result.detail, result=result.tool_result.data)
 
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(req: ChatRequest) -> ChatResponse:
-    try:
-        result = bathy.handle(req.message, agent_selector=req.agent_selector, max_tokens=req.max_tokens)
-    except FileNotFoundError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:  # pragma: no cover
-        raise HTTPException(status_code=500, detail=f"Model inference error: {e}")
-
-    trace_items = [AgentTraceItem(agent=p.agent, role=p.role, proposal=p.proposal) for p in result.trace]
-    # All advisors share the same underlying model for now (Qwen/TinyLlama via GPT4All)
-    from .models_backend import ModelBackend  # local import to avoid circulars at import time
-
-    backend = ModelBackend.instance()
-    used_model_path = str(backend.model_path)
-
-    # Optional: ask the model for structured suggested actions.
+def _plan_actions(backend: Any, message: str, output: str) -> List[SuggestedAction]:
+    """Ask the model for structured follow-up actions; empty on any failure."""
     suggested_actions: List[SuggestedAction] = []
     try:
-        tools_list = ", ".join(load_config().get("allowed_tools", []))
+        tools_list = tools_prompt(load_config().get("allowed_tools", []))
         planner_prompt = (
             "You are Bathy, planning potential follow-up actions for the owner's request. "
             "You have access to tools with these names: "
@@ -225,8 +227,8 @@ async def chat(req: ChatRequest) -> ChatResponse:
             "actions as JSON. Use a list of objects with keys 'kind', 'description', "
             "'tool_name', and 'tool_args'. 'kind' can be 'tool', 'note', or 'automation_idea'. "
             "If no actions are appropriate, return an empty JSON list.\n\n"
-            f"User request: {req.message}\n"
-            f"Bathy reply: {result.output}\n"
+            f"User request: {message}\n"
+            f"Bathy reply: {output}\n"
         )
         raw_plan = backend.generate(planner_prompt, max_tokens=256, temperature=0.2)
         import json as _json
@@ -246,17 +248,21 @@ async def chat(req: ChatRequest) -> ChatResponse:
                 continue
     except Exception:
         suggested_actions = []
+    return suggested_actions
+
 
+def _record_chat(req: ChatRequest, output: str, suggested_actions: List[SuggestedAction]) -> None:
+    """Post-reply hooks: owner profile, long-term memory and the action queue."""
     # Self-learning hook: record chat for the owner profile, and optionally
     # feed into long-term memory if configured.
-    _user_profile_store.record_chat(req.message, result.output)
+    _user_profile_store.record_chat(req.message, output)
     cfg = load_config()
     if cfg.get("memory_auto_ingest_from_api", True):
         memory_backend.ingest_items(
             [
                 {
-                    "id": f"api-chat-{hash((req.message, result.output))}",
-                    "text": f"User: {req.message}\nAssistant: {result.output}",
+                    "id": stable_id("api-chat", req.message, output),
+                    "text": f"User: {req.message}\nAssistant: {output}",
                     "meta": {"source": "api_chat", "agent_selector": req.agent_selector or "council"},
                 }
             ]
@@ -275,15 +281,81 @@ async def chat(req: ChatRequest) -> ChatResponse:
                 for sa in suggested_actions
             ],
             source_message=req.message,
-            source_reply=result.output,
+            source_reply=output,
         )
     except Exception:
         # Queueing should never break the main chat path.
         pass
 
-    return ChatResponse(
+
+def _finish_chat(req: ChatRequest, backend: Any, output: str) -> List[SuggestedAction]:
+    """Plan follow-up actions, then run the post-reply hooks."""
+    suggested_actions = _plan_actions(backend, req.message, output)
+    _record_chat(req, output, suggested_actions)
+    return suggested_actions
+
+
+# Runs _finish_chat for streamed chats independently of the HTTP connection,
+# so a client that disconnects after the reply still has its exchange
+# planned and recorded. Model calls are serialized by ModelBackend itself.
+_chat_followups = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-followup")
+
+
+def _sse(event: str, data: str) -> bytes:
+    return f"event: {event}\ndata: {data}\n\n".encode("utf-8")
+
+
+def _chat_events(reply: ChatResponse, followup: "Future[List[SuggestedAction]]") -> Iterator[bytes]:
+    """Server-sent events for a streamed /chat.
+
+    ``reply`` (no actions yet) goes out as soon as the council has answered;
+    ``done`` follows with the full ChatResponse once ``followup`` (already
+    running, see _chat_followups) has planned the actions.
+    """
+    yield _sse("reply", reply.model_dump_json())
+    suggested_actions = followup.result()
+    done = reply.model_copy(update={"suggested_actions": suggested_actions})
+    yield _sse("done", done.model_dump_json())
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat(req: ChatRequest) -> Response:
+    try:
+        result = bathy.handle(req.message, agent_selector=req.agent_selector, max_tokens=req.max_tokens)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:  # pragma: no cover
+        raise HTTPException(status_code=500, detail=f"Model inference error: {e}")
+
+    # Trace entries come from our own agents; skip re-validating them.
+    trace_items = [
+        AgentTraceItem.model_construct(agent=p.agent, role=p.role, proposal=p.proposal)
+        for p in result.trace
+    ]
+    # All advisors share the same underlying model for now (Qwen/TinyLlama via GPT4All)
+    from .models_backend import ModelBackend  # local import to avoid circulars at import time
+
+    backend = ModelBackend.instance()
+    used_model_path = str(backend.model_path)
+
+    if req.stream:
+        reply = ChatResponse.model_construct(
+            output=result.output,
+            used_model=used_model_path,
+            agent_trace=trace_items,
+            suggested_actions=[],
+        )
+        followup = _chat_followups.submit(_finish_chat, req, backend, result.output)
+        return StreamingResponse(_chat_events(reply, followup), media_type="text/event-stream")
+
+    suggested_actions = _finish_chat(req, backend, result.output)
+
+    response = ChatResponse.model_construct(
         output=result.output,
         used_model=used_model_path,
         agent_trace=trace_items,
         suggested_actions=suggested_actions,
     )
+    # Serialize with pydantic-core directly instead of letting FastAPI
+    # re-validate the model against response_model and run jsonable_encoder.
+    return Response(content=response.model_dump_json(), media_type="application/json")
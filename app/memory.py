@@ -1,38 +1,75 @@
-import json
+import os
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+from .clock import now_iso
+from .json_utils import dumps_line, loads
+
 class MemoryManager:
-    """Manages conversation memory and semantic storage."""
+    """Manages conversation memory and semantic storage.
+    
+    messages.jsonl is append-only. Expired records are not rewritten away
+    immediately; their record numbers are appended to tombstones.jsonl and the
+    log is compacted only once tombstones outnumber COMPACT_RATIO of the live
+    messages.
+    """
+    
+    COMPACT_RATIO = 0.3
     
     def __init__(self, memory_dir: Path):
         self.memory_dir = memory_dir
         self.messages_file = memory_dir / "messages.jsonl"
+        self.tombstones_file = memory_dir / "tombstones.jsonl"
+        # Record number (ordinal of non-empty line in messages.jsonl) of each
+        # entry in self.messages, kept in parallel.
+        self._record_nos: List[int] = []
+        self._next_record = 0
+        self._tombstone_count = 0
         self.messages = self._load_messages()
     
+    def _load_tombstones(self) -> set:
+        """Load record numbers of deleted messages."""
+        dead = set()
+        if self.tombstones_file.exists():
+            with open(self.tombstones_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        dead.add(loads(line))
+        return dead
+    
     def _load_messages(self) -> List[Dict]:
-        """Load messages from storage."""
+        """Load messages from storage, skipping tombstoned records."""
         messages = []
+        dead = self._load_tombstones()
+        self._tombstone_count = len(dead)
+        record_no = 0
         if self.messages_file.exists():
-            with open(self.messages_file, 'r') as f:
+            with open(self.messages_file, 'rb') as f:
                 for line in f:
-                    if line.strip():
-                        messages.append(json.loads(line))
+                    if not line.strip():
+                        continue
+                    if record_no not in dead:
+                        messages.append(loads(line))
+                        self._record_nos.append(record_no)
+                    record_no += 1
+        self._next_record = record_no
         return messages
     
     def add_message(self, user_message: Optional[str] = None, assistant_message: Optional[str] = None):
         """Add message to memory."""
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "user": user_message,
             "assistant": assistant_message
         }
         self.messages.append(entry)
+        self._record_nos.append(self._next_record)
+        self._next_record += 1
         
         # Persist
-        with open(self.messages_file, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
+        with open(self.messages_file, 'ab') as f:
+            f.write(dumps_line(entry))
     
     def get_context(self, k: int = 10) -> Dict:
         """Get recent context for agent decision-making."""
@@ -63,12 +100,37 @@ class MemoryManager:
     def cleanup_old_entries(self, days: int = 30):
         """Remove messages older than specified days."""
         cutoff = datetime.now() - timedelta(days=days)
-        self.messages = [
-            m for m in self.messages
-            if datetime.fromisoformat(m["timestamp"]) > cutoff
-        ]
+        kept, kept_nos, expired_nos = [], [], []
+        for m, record_no in zip(self.messages, self._record_nos):
+            if datetime.fromisoformat(m["timestamp"]) > cutoff:
+                kept.append(m)
+                kept_nos.append(record_no)
+            else:
+                expired_nos.append(record_no)
+        if not expired_nos:
+            return
+        
+        self.messages = kept
+        self._record_nos = kept_nos
+        self._tombstone_count += len(expired_nos)
         
-        # Re-write file
-        with open(self.messages_file, 'w') as f:
+        if self._tombstone_count > len(self.messages) * self.COMPACT_RATIO:
+            self._compact()
+            return
+        
+        with open(self.tombstones_file, 'ab') as f:
+            for record_no in expired_nos:
+                f.write(dumps_line(record_no))
+    
+    def _compact(self):
+        """Rewrite messages.jsonl with live messages only and drop tombstones."""
+        tmp_file = self.messages_file.with_name(self.messages_file.name + ".tmp")
+        with open(tmp_file, 'wb') as f:
             for m in self.messages:
-                f.write(json.dumps(m) + '\n')
+                f.write(dumps_line(m))
+        os.replace(tmp_file, self.messages_file)
+        if self.tombstones_file.exists():
+            self.tombstones_file.unlink()
+        self._record_nos = list(range(len(self.messages)))
+        self._next_record = len(self.messages)
+        self._tombstone_count = 0
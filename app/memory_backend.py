@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-import json
+import hashlib
+import heapq
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 
 from .config import ROOT, load_config
+from .json_utils import loads
 
 try:
     import chromadb
@@ -13,6 +16,11 @@ except Exception:  # pragma: no cover
     chromadb = None  # type: ignore
     embedding_functions = None  # type: ignore
 
+try:
+    import xxhash
+except Exception:  # pragma: no cover
+    xxhash = None  # type: ignore
+
 
 MEM_DIR = ROOT / "data" / "memory"
 MEM_DIR.mkdir(parents=True, exist_ok=True)
@@ -20,6 +28,34 @@ CHROMA_DIR = MEM_DIR / "chroma"
 CHUNKS_FALLBACK = ROOT / "memory" / "chunks.jsonl"
 
 
+def stable_id(prefix: str, *parts: str) -> str:
+    """Build a memory item id that is identical across processes and restarts.
+
+    Python's built-in hash() is salted per process, so it cannot be used for
+    ids that outlive the interpreter. xxh3 is used when installed, otherwise
+    blake2b from the standard library.
+    """
+
+    data = "\x1f".join(parts).encode("utf-8")
+    if xxhash is not None:
+        digest = xxhash.xxh3_64_hexdigest(data)
+    else:
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+    return f"{prefix}-{digest}"
+
+
+@lru_cache(maxsize=1)
+def _get_embedder() -> Any:
+    """Process-wide sentence-transformers embedder (loaded on first use)."""
+    return embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
+
+
+@lru_cache(maxsize=None)
+def _get_client(path: str) -> Any:
+    """Process-wide Chroma client per storage directory."""
+    return chromadb.PersistentClient(path=path)
+
+
 class MemoryBackend:
     """Embeddings-based memory over chats/docs with keyword fallback.
 
@@ -32,15 +68,17 @@ class MemoryBackend:
         self.client = None
         self.collection = None
         self.embedder = None
+        # Ids already stored in the collection; lets ingest_items skip repeats
+        # instead of growing the index with duplicates.
+        self._seen_ids: Set[str] = set()
         if chromadb is not None and embedding_functions is not None:
             try:
-                self.client = chromadb.PersistentClient(path=str(CHROMA_DIR))
-                self.embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
-                    model_name="all-MiniLM-L6-v2"
-                )
+                self.client = _get_client(str(CHROMA_DIR))
+                self.embedder = _get_embedder()
                 self.collection = self.client.get_or_create_collection(
                     name="goodboy_memory", embedding_function=self.embedder
                 )
+                self._seen_ids = set(self.collection.get(include=[])["ids"])
             except Exception:
                 self.client = None
                 self.collection = None
@@ -50,16 +88,23 @@ class MemoryBackend:
     def ingest_items(self, items: List[Dict[str, Any]]) -> int:
         """Ingest items into embeddings memory.
 
-        Each item: {"id": str, "text": str, "meta": {..}}.
+        Each item: {"id": str, "text": str, "meta": {..}}. Items whose id is
+        already stored are skipped; returns the number actually added.
         """
         if not self.collection:
             return 0
-        if not items:
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for it in items:
+            if it["id"] not in self._seen_ids:
+                fresh.setdefault(it["id"], it)
+        if not fresh:
             return 0
+        items = list(fresh.values())
         ids = [it["id"] for it in items]
         texts = [it["text"] for it in items]
         metadatas = [it.get("meta", {}) for it in items]
         self.collection.add(ids=ids, documents=texts, metadatas=metadatas)
+        self._seen_ids.update(ids)
         return len(items)
 
     # --- Query ---
@@ -68,16 +113,12 @@ class MemoryBackend:
         if self.collection is not None:
             try:
                 res = self.collection.query(query_texts=[query], n_results=k)
-                out: List[Dict[str, Any]] = []
-                for i in range(len(res.get("ids", [[]])[0])):
-                    out.append(
-                        {
-                            "id": res["ids"][0][i],
-                            "text": res["documents"][0][i],
-                            "meta": res["metadatas"][0][i],
-                        }
-                    )
-                return out
+                ids = res.get("ids", [[]])[0]
+                if not ids:
+                    return []
+                docs = res["documents"][0]
+                metas = res["metadatas"][0]
+                return [{"id": i, "text": t, "meta": m} for i, t, m in zip(ids, docs, metas)]
             except Exception:
                 pass
         # Fallback: keyword over chunks.jsonl
@@ -87,16 +128,19 @@ class MemoryBackend:
         if not CHUNKS_FALLBACK.exists():
             return []
         q = set(w.lower() for w in query.split())
+        if not q or k <= 0:
+            return []
+        # Only rows sharing at least one token with the query are kept.
         rows: List[Dict[str, Any]] = []
-        with CHUNKS_FALLBACK.open("r", encoding="utf-8") as f:
+        with CHUNKS_FALLBACK.open("rb") as f:
             for line in f:
                 try:
-                    obj = json.loads(line)
+                    obj = loads(line)
                 except Exception:
                     continue
                 text = obj.get("text", "")
-                tokens = set(w.lower() for w in text.split())
-                score = len(q & tokens)
+                score = len(q.intersection(w.lower() for w in text.split()))
+                if not score:
+                    continue
                 rows.append({"score": score, "id": f"fallback-{obj.get('source','')}-{obj.get('idx',0)}", "text": text, "meta": obj})
-        rows.sort(key=lambda r: r["score"], reverse=True)
-        return rows[:k]
+        return heapq.nlargest(k, rows, key=lambda r: r["score"])
@@ -1,9 +1,24 @@
-import json
+import atexit
+import re
+from collections import deque
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from enum import Enum
 
+from .clock import now_iso
+from .json_utils import dumps, dumps_line, iter_jsonl, loads, tail_jsonl, write_atomic
+from .jsonl_writer import get_writer
+
+_ERROR_RE = re.compile("error", re.IGNORECASE)
+
+# _analyze_performance text indexed by (long_output << 1) | has_error.
+_ANALYSIS = (
+    "Performance Analysis: Brief response noted. Execution successful. ",
+    "Performance Analysis: Brief response noted. Issue encountered - flagged for improvement. ",
+    "Performance Analysis: Comprehensive response provided. Execution successful. ",
+    "Performance Analysis: Comprehensive response provided. Issue encountered - flagged for improvement. ",
+)
+
 class ReflectionType(Enum):
     """Types of self-reflections."""
     PERFORMANCE = "performance"
@@ -12,7 +27,19 @@ class ReflectionType(Enum):
     EVOLUTION = "evolution"
 
 class EvolutionSystem:
-    """Manages GoodBoy.AI's learning, growth, and self-reflection."""
+    """Manages GoodBoy.AI's learning, growth, and self-reflection.
+    
+    evolution.json is a periodic snapshot. Each interaction in between is
+    appended to evolution.delta.jsonl and replayed over the snapshot on load,
+    so a chat costs one small append instead of a full state rewrite.
+    """
+    
+    # Write a full snapshot (and truncate the delta log) every N interactions.
+    SNAPSHOT_EVERY = 100
+    # Entries of each append-only log kept in memory for get_recent_activity(),
+    # seeded at startup from at most RECENT_TAIL_BYTES at the end of each file.
+    RECENT_LIMIT = 1024
+    RECENT_TAIL_BYTES = 256 * 1024
     
     def __init__(self, memory_dir: Path):
         self.memory_dir = memory_dir
@@ -20,16 +47,34 @@ class EvolutionSystem:
         self.overseer_file = memory_dir / "overseer_suggestions.jsonl"
         self.processed_file = memory_dir / "processed_actions.jsonl"
         self.evolution_file = memory_dir / "evolution.json"
+        self.delta_file = memory_dir / "evolution.delta.jsonl"
+        self._writer = get_writer()
         
         for f in [self.reflections_file, self.overseer_file, self.processed_file]:
             f.touch(exist_ok=True)
         
+        self.recent_reflections = self._load_recent(self.reflections_file)
+        self.recent_suggestions = self._load_recent(self.overseer_file)
+        self.recent_actions = self._load_recent(self.processed_file)
+        
         self.evolution_state = self._load_evolution_state()
+        # (agent, proficiency) with the lowest score, kept current by
+        # _apply_interaction so suggest_actions need not scan every agent.
+        self._lowest_agent = self._find_lowest_agent()
+        self._dirty_count = self._replay_deltas()
+        self._delta_handle = open(self.delta_file, 'ab')
+        self._terminate_torn_delta()
+        atexit.register(self.close)
+    
+    def _load_recent(self, path: Path) -> deque:
+        """Seed an in-memory tail of an append-only log from the end of its file."""
+        records = tail_jsonl(path, self.RECENT_LIMIT, self.RECENT_TAIL_BYTES)
+        return deque(records, maxlen=self.RECENT_LIMIT)
     
     def _load_evolution_state(self) -> Dict:
         """Load or initialize evolution state."""
         if self.evolution_file.exists():
-            return json.loads(self.evolution_file.read_text())
+            return loads(self.evolution_file.read_bytes())
         
         return {
             "version": "1.0",
@@ -46,7 +91,7 @@ class EvolutionSystem:
             },
             "learned_patterns": [],
             "optimizations": [],
-            "created_at": datetime.now().isoformat()
+            "created_at": now_iso()
         }
     
     def record_interaction(self, 
@@ -55,14 +100,70 @@ class EvolutionSystem:
                           agents_used: List[str],
                           success: bool = True):
         """Record interaction for learning."""
+        self._apply_interaction(success, agents_used)
+        
+        delta = {
+            "seq": self.evolution_state["total_interactions"],
+            "ts": now_iso(),
+            "ok": success,
+            "agents": agents_used
+        }
+        self._delta_handle.write(dumps_line(delta))
+        self._delta_handle.flush()
+        
+        self._dirty_count += 1
+        if self._dirty_count >= self.SNAPSHOT_EVERY:
+            self._save_evolution_state()
+    
+    def _apply_interaction(self, success: bool, agents_used: List[str]):
+        """Fold one interaction into the in-memory counters."""
         self.evolution_state["total_interactions"] += 1
         if success:
             self.evolution_state["successful_resolutions"] += 1
+            proficiency = self.evolution_state["agent_proficiency"]
             for agent in agents_used:
-                if agent in self.evolution_state["agent_proficiency"]:
-                    self.evolution_state["agent_proficiency"][agent] += 0.1
+                if agent in proficiency:
+                    proficiency[agent] += 0.1
+            # Scores only go up, so the minimum moves only when its holder improves.
+            if self._lowest_agent is not None and self._lowest_agent[0] in agents_used:
+                self._lowest_agent = self._find_lowest_agent()
+    
+    def _find_lowest_agent(self) -> Optional[Tuple[str, float]]:
+        """Scan agent proficiency for the lowest-scoring agent."""
+        return min(
+            self.evolution_state["agent_proficiency"].items(),
+            key=lambda x: x[1],
+            default=None
+        )
+    
+    def _replay_deltas(self) -> int:
+        """Apply interactions logged after the last snapshot; return how many.
         
-        self._save_evolution_state()
+        Deltas carry the interaction count they produced, so entries already
+        folded into the snapshot (e.g. after a crash mid-snapshot) are skipped.
+        """
+        replayed = 0
+        for delta in iter_jsonl(self.delta_file):
+            if delta.get("seq", 0) <= self.evolution_state["total_interactions"]:
+                continue
+            self._apply_interaction(delta.get("ok", True), delta.get("agents", []))
+            replayed += 1
+        return replayed
+    
+    def _terminate_torn_delta(self):
+        """End a torn last line (crash mid-append) so new deltas start clean.
+        
+        Replay already skipped the partial record; without the newline the
+        next append would be glued onto it and lost on the following load.
+        """
+        if self._delta_handle.tell() == 0:
+            return
+        with open(self.delta_file, 'rb') as f:
+            f.seek(-1, 2)
+            torn = f.read(1) != b"\n"
+        if torn:
+            self._delta_handle.write(b"\n")
+            self._delta_handle.flush()
     
     def reflect_on_performance(self, 
                               message: str, 
@@ -77,37 +178,29 @@ class EvolutionSystem:
             reflection_type = ReflectionType.EVOLUTION
         
         reflection = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "type": reflection_type.value,
             "message_length": len(message),
             "confidence": confidence,
-            "analysis": self._analyze_performance(message, output),
-            "next_steps": self._suggest_improvements(output, confidence)
+            "analysis": EvolutionSystem._analyze_performance(message, output),
+            "next_steps": EvolutionSystem._suggest_improvements(output, confidence)
         }
         
         # Store reflection
-        with open(self.reflections_file, 'a') as f:
-            f.write(json.dumps(reflection) + '\n')
+        self._writer.append(self.reflections_file, reflection)
+        self.recent_reflections.append(reflection)
         
         return reflection["analysis"]
     
-    def _analyze_performance(self, message: str, output: str) -> str:
+    @staticmethod
+    def _analyze_performance(message: str, output: str) -> str:
         """Analyze how well GoodBoy handled the interaction."""
-        analysis = "Performance Analysis: "
-        
-        if len(output) > 200:
-            analysis += "Comprehensive response provided. "
-        else:
-            analysis += "Brief response noted. "
-        
-        if "error" in output.lower():
-            analysis += "Issue encountered - flagged for improvement. "
-        else:
-            analysis += "Execution successful. "
-        
-        return analysis
+        long_output = len(output) > 200
+        has_error = _ERROR_RE.search(output) is not None
+        return _ANALYSIS[(long_output << 1) | has_error]
     
-    def _suggest_improvements(self, output: str, confidence: float) -> List[str]:
+    @staticmethod
+    def _suggest_improvements(output: str, confidence: float) -> List[str]:
         """Suggest improvements based on performance."""
         suggestions = []
         
@@ -130,41 +223,38 @@ class EvolutionSystem:
                 "id": "memory_optimize",
                 "description": "Perform memory consolidation and optimization",
                 "priority": "medium",
-                "suggested_at": datetime.now().isoformat()
+                "suggested_at": now_iso()
             })
         
         # Action 2: Agent performance rebalancing
-        low_performer = min(
-            self.evolution_state["agent_proficiency"].items(),
-            key=lambda x: x[1]
-        )
-        if low_performer[1] < 0.8:
+        low_performer = self._lowest_agent
+        if low_performer is not None and low_performer[1] < 0.8:
             actions.append({
                 "id": "rebalance_agents",
                 "description": f"Improve {low_performer[0]} performance ({low_performer[1]:.2f})",
                 "priority": "high",
                 "target_agent": low_performer[0],
-                "suggested_at": datetime.now().isoformat()
+                "suggested_at": now_iso()
             })
         
         # Store suggestions
         for action in actions:
-            with open(self.overseer_file, 'a') as f:
-                f.write(json.dumps(action) + '\n')
+            self._writer.append(self.overseer_file, action)
+        self.recent_suggestions.extend(actions)
         
         return actions
     
     def process_and_log_action(self, action_id: str, result: Dict):
         """Log processed actions for tracking."""
         processed = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "action_id": action_id,
             "result": result,
             "generation": self.evolution_state["generation"]
         }
         
-        with open(self.processed_file, 'a') as f:
-            f.write(json.dumps(processed) + '\n')
+        self._writer.append(self.processed_file, processed)
+        self.recent_actions.append(processed)
     
     def trigger_generation_increment(self):
         """Mark a new evolutionary generation."""
@@ -174,14 +264,34 @@ class EvolutionSystem:
         return {
             "generation": self.evolution_state["generation"],
             "interactions_this_gen": self.evolution_state["total_interactions"],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
     
     def _save_evolution_state(self):
-        """Persist evolution state."""
-        self.evolution_file.write_text(
-            json.dumps(self.evolution_state, indent=2)
-        )
+        """Persist a full snapshot and start a fresh delta log."""
+        write_atomic(self.evolution_file, dumps(self.evolution_state, indent=True))
+        self._delta_handle.close()
+        self._delta_handle = open(self.delta_file, 'wb')
+        self._dirty_count = 0
+    
+    def close(self):
+        """Snapshot pending interactions and release the delta log handle."""
+        if self._delta_handle.closed:
+            return
+        if self._dirty_count:
+            self._save_evolution_state()
+        self._delta_handle.close()
+    
+    def get_recent_activity(self, limit: int = 20) -> Dict[str, List[Dict]]:
+        """Latest reflections, suggestions and processed actions, from memory."""
+        def last(entries: deque) -> List[Dict]:
+            return list(entries)[-limit:] if limit > 0 else []
+        
+        return {
+            "reflections": last(self.recent_reflections),
+            "suggestions": last(self.recent_suggestions),
+            "processed_actions": last(self.recent_actions)
+        }
     
     def get_status(self) -> Dict:
         """Get full evolution status."""
@@ -193,5 +303,5 @@ class EvolutionSystem:
                 max(self.evolution_state["total_interactions"], 1)
             ),
             "agent_proficiency": self.evolution_state["agent_proficiency"],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
@@ -1,26 +1,48 @@
-import json
+import os
 from pathlib import Path
-from datetime import datetime
 from typing import List, Dict
 import uuid
 
+from .clock import now_iso
+from .json_utils import dumps_line, iter_jsonl
+from .jsonl_writer import get_writer
+
 class MiniBotNursery:
-    """Generates and manages mini-bots (specialized sub-agents that evolve)."""
+    """Generates and manages mini-bots (specialized sub-agents that evolve).
+    
+    minibots.jsonl is append-only: every spawn or update writes the bot's full
+    record, and the last record per id wins on load. The file is compacted
+    once it holds more than COMPACT_FACTOR records per live bot.
+    """
+    
+    COMPACT_FACTOR = 2
     
     def __init__(self, memory_dir: Path):
         self.memory_dir = memory_dir
         self.minibots_file = memory_dir / "minibots.jsonl"
-        self.minibots = self._load_minibots()
+        self._writer = get_writer()
+        self._file_records = 0
+        # Bots keyed by id (insertion-ordered), plus the active subset.
+        self.minibots_by_id: Dict[str, Dict] = self._load_minibots()
+        self._active: Dict[str, Dict] = {
+            bot_id: bot for bot_id, bot in self.minibots_by_id.items()
+            if bot["status"] == "active"
+        }
+    
+    @property
+    def minibots(self) -> List[Dict]:
+        """All mini-bots in spawn order."""
+        return list(self.minibots_by_id.values())
     
-    def _load_minibots(self) -> List[Dict]:
-        """Load existing mini-bots."""
-        minibots = []
-        if self.minibots_file.exists():
-            with open(self.minibots_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        minibots.append(json.loads(line))
-        return minibots
+    def _load_minibots(self) -> Dict[str, Dict]:
+        """Load existing mini-bots (latest record per id)."""
+        by_id: Dict[str, Dict] = {}
+        self._file_records = 0
+        self._writer.flush(self.minibots_file)
+        for bot in iter_jsonl(self.minibots_file):
+            by_id[bot["id"]] = bot
+            self._file_records += 1
+        return by_id
     
     def spawn_minibot(self, 
                      specialization: str,
@@ -30,42 +52,56 @@ class MiniBotNursery:
         
         minibot = {
             "id": str(uuid.uuid4())[:8],
-            "name": f"{parent_agent}_mini_{len(self.minibots)}",
+            "name": f"{parent_agent}_mini_{len(self.minibots_by_id)}",
             "specialization": specialization,
             "parent_agent": parent_agent,
             "trigger_pattern": trigger_pattern,
-            "created_at": datetime.now().isoformat(),
+            "created_at": now_iso(),
             "performance": 1.0,
             "interactions": 0,
             "status": "active"
         }
         
-        self.minibots.append(minibot)
+        self.minibots_by_id[minibot["id"]] = minibot
+        self._active[minibot["id"]] = minibot
         
         # Persist
-        with open(self.minibots_file, 'a') as f:
-            f.write(json.dumps(minibot) + '\n')
+        self._writer.append(self.minibots_file, minibot)
+        self._file_records += 1
         
         return minibot
     
     def update_minibot_performance(self, minibot_id: str, quality: float):
         """Update mini-bot's performance metrics."""
-        for bot in self.minibots:
-            if bot["id"] == minibot_id:
-                bot["interactions"] += 1
-                bot["performance"] = (bot["performance"] * (bot["interactions"] - 1) + quality) / bot["interactions"]
-                
-                # Retire low performers
-                if bot["performance"] < 0.3:
-                    bot["status"] = "retired"
-                
-                break
+        bot = self.minibots_by_id.get(minibot_id)
+        if bot is None:
+            return
         
-        # Persist
-        with open(self.minibots_file, 'w') as f:
-            for bot in self.minibots:
-                f.write(json.dumps(bot) + '\n')
+        bot["interactions"] += 1
+        bot["performance"] = (bot["performance"] * (bot["interactions"] - 1) + quality) / bot["interactions"]
+        
+        # Retire low performers
+        if bot["performance"] < 0.3:
+            bot["status"] = "retired"
+            self._active.pop(minibot_id, None)
+        
+        # Persist the updated record only
+        self._writer.append(self.minibots_file, bot)
+        self._file_records += 1
+        if self._file_records > self.COMPACT_FACTOR * len(self.minibots_by_id):
+            self.compact()
+    
+    def compact(self):
+        """Rewrite minibots.jsonl with one record per bot."""
+        # Flush queued appends first so they cannot land after the rewrite.
+        self._writer.flush(self.minibots_file)
+        tmp_file = self.minibots_file.with_name(self.minibots_file.name + ".tmp")
+        with open(tmp_file, 'wb') as f:
+            for bot in self.minibots_by_id.values():
+                f.write(dumps_line(bot))
+        os.replace(tmp_file, self.minibots_file)
+        self._file_records = len(self.minibots_by_id)
     
     def get_active_minibots(self) -> List[Dict]:
         """Get all active mini-bots."""
-        return [bot for bot in self.minibots if bot["status"] == "active"]
+        return list(self._active.values())
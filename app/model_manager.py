@@ -1,37 +1,62 @@
 """Model Manager - Downloads, validates, and manages GGUF models."""
 import os
 import hashlib
-import requests
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, List, Dict, Callable
+from typing import Optional, List, Dict, Callable, NamedTuple, Tuple
 import json
 from datetime import datetime
-import shutil
+
+from .json_utils import dumps, write_atomic
+
+# Parallel download tuning: files at least PARALLEL_MIN_SIZE bytes served with
+# byte-range support are fetched over DOWNLOAD_CONNECTIONS concurrent requests.
+DOWNLOAD_CONNECTIONS = 8
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+
+
+class ModelSpec(NamedTuple):
+    """Metadata for a known downloadable model."""
+    name: str
+    url: str
+    size_mb: int
+    sha256: Optional[str]  # Optional validation
+    description: str
+    min_ram_gb: int
+
 
 # Known good models with their metadata
-KNOWN_MODELS = {
-    "qwen2.5-7b-instruct-q5_k_m": {
-        "url": "https://huggingface.co/Qwen/Qwen2.5-7B-Instruct-GGUF/resolve/main/qwen2.5-7b-instruct-q5_k_m-00001-of-00002.gguf",
-        "size_mb": 5200,
-        "sha256": None,  # Optional validation
-        "description": "Qwen 2.5 7B - Recommended for general use",
-        "min_ram_gb": 8
-    },
-    "mistral-7b-instruct-v0.2-q4_k_m": {
-        "url": "https://huggingface.co/TheBloke/Mistral-7B-Instruct-v0.2-GGUF/resolve/main/mistral-7b-instruct-v0.2.Q4_K_M.gguf",
-        "size_mb": 4370,
-        "sha256": None,
-        "description": "Mistral 7B - Fast and efficient",
-        "min_ram_gb": 6
-    },
-    "phi-3-mini-4k-instruct-q4_k_m": {
-        "url": "https://huggingface.co/microsoft/Phi-3-mini-4k-instruct-gguf/resolve/main/Phi-3-mini-4k-instruct-q4.gguf",
-        "size_mb": 2400,
-        "sha256": None,
-        "description": "Phi-3 Mini - Lightweight, good for low-RAM systems",
-        "min_ram_gb": 4
-    }
-}
+KNOWN_MODELS: Tuple[ModelSpec, ...] = (
+    ModelSpec(
+        name="qwen2.5-7b-instruct-q5_k_m",
+        url="https://huggingface.co/Qwen/Qwen2.5-7B-Instruct-GGUF/resolve/main/qwen2.5-7b-instruct-q5_k_m-00001-of-00002.gguf",
+        size_mb=5200,
+        sha256=None,
+        description="Qwen 2.5 7B - Recommended for general use",
+        min_ram_gb=8
+    ),
+    ModelSpec(
+        name="mistral-7b-instruct-v0.2-q4_k_m",
+        url="https://huggingface.co/TheBloke/Mistral-7B-Instruct-v0.2-GGUF/resolve/main/mistral-7b-instruct-v0.2.Q4_K_M.gguf",
+        size_mb=4370,
+        sha256=None,
+        description="Mistral 7B - Fast and efficient",
+        min_ram_gb=6
+    ),
+    ModelSpec(
+        name="phi-3-mini-4k-instruct-q4_k_m",
+        url="https://huggingface.co/microsoft/Phi-3-mini-4k-instruct-gguf/resolve/main/Phi-3-mini-4k-instruct-q4.gguf",
+        size_mb=2400,
+        sha256=None,
+        description="Phi-3 Mini - Lightweight, good for low-RAM systems",
+        min_ram_gb=4
+    ),
+)
+
+KNOWN_MODELS_BY_NAME: Dict[str, ModelSpec] = {m.name: m for m in KNOWN_MODELS}
+_AVAILABLE_MODELS: List[Dict] = [m._asdict() for m in KNOWN_MODELS]
 
 
 class ModelManager:
@@ -42,6 +67,32 @@ class ModelManager:
         self.models_dir.mkdir(parents=True, exist_ok=True)
         self.registry_file = self.models_dir / "registry.json"
         self.registry = self._load_registry()
+        # (models_dir mtime_ns, active_model) -> list_local_models() result
+        self._local_models_key = None
+        self._local_models: List[Dict] = []
+        self._http = None  # httpx.Client, created by _client() on first download
+    
+    def _client(self):
+        """Shared keep-alive pool for probes, streamed and ranged downloads.
+        
+        httpx is imported here so listing or switching models never pays for
+        it. HTTP/1.1 on purpose: parallel range requests should each get their
+        own TCP connection rather than share one HTTP/2 connection.
+        """
+        if self._http is None:
+            import httpx
+            self._http = httpx.Client(
+                follow_redirects=True,
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_connections=DOWNLOAD_CONNECTIONS * 2)
+            )
+        return self._http
+    
+    def close(self):
+        """Release pooled HTTP connections."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
     
     def _load_registry(self) -> Dict:
         """Load model registry."""
@@ -54,26 +105,40 @@ class ModelManager:
     
     def _save_registry(self):
         """Save model registry."""
-        self.registry_file.write_text(json.dumps(self.registry, indent=2))
+        write_atomic(self.registry_file, dumps(self.registry, indent=True))
     
     def list_available_models(self) -> List[Dict]:
         """List known downloadable models."""
-        return [
-            {"name": name, **info}
-            for name, info in KNOWN_MODELS.items()
-        ]
+        return list(_AVAILABLE_MODELS)
     
     def list_local_models(self) -> List[Dict]:
-        """List locally available models."""
-        models = []
-        for gguf_file in self.models_dir.glob("*.gguf"):
-            models.append({
-                "name": gguf_file.stem,
-                "path": str(gguf_file),
-                "size_mb": gguf_file.stat().st_size / (1024 * 1024),
-                "is_active": str(gguf_file) == self.registry.get("active_model")
-            })
-        return models
+        """List locally available models.
+        
+        The scan is cached until the models directory changes or the active
+        model is switched.
+        """
+        active = self.registry.get("active_model")
+        key = (self.models_dir.stat().st_mtime_ns, active)
+        if key != self._local_models_key:
+            models = []
+            with os.scandir(self.models_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".gguf") or not entry.is_file():
+                        continue
+                    path = str(self.models_dir / entry.name)
+                    models.append({
+                        "name": entry.name[:-len(".gguf")],
+                        "path": path,
+                        "size_mb": entry.stat().st_size / (1024 * 1024),
+                        "is_active": path == active
+                    })
+            self._local_models = models
+            self._local_models_key = key
+        return [dict(m) for m in self._local_models]
+    
+    def _invalidate_local_models(self):
+        """Drop the cached list_local_models() result."""
+        self._local_models_key = None
     
     def download_model(
         self, 
@@ -81,11 +146,11 @@ class ModelManager:
         progress_callback: Optional[Callable[[float, str], None]] = None
     ) -> Path:
         """Download a model from known sources."""
-        if model_name not in KNOWN_MODELS:
-            raise ValueError(f"Unknown model: {model_name}. Available: {list(KNOWN_MODELS.keys())}")
+        model_info = KNOWN_MODELS_BY_NAME.get(model_name)
+        if model_info is None:
+            raise ValueError(f"Unknown model: {model_name}. Available: {list(KNOWN_MODELS_BY_NAME)}")
         
-        model_info = KNOWN_MODELS[model_name]
-        url = model_info["url"]
+        url = model_info.url
         filename = url.split("/")[-1]
         target_path = self.models_dir / filename
         
@@ -101,33 +166,32 @@ class ModelManager:
         temp_path = target_path.with_suffix(".download")
         
         try:
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size and progress_callback:
-                            progress = downloaded / total_size
-                            progress_callback(progress, f"Downloading: {downloaded / (1024*1024):.1f} MB / {total_size / (1024*1024):.1f} MB")
+            total_size, ranged = self._probe_download(url)
+            file_hash = None
+            if ranged and total_size >= PARALLEL_MIN_SIZE:
+                self._download_ranged(url, temp_path, total_size, progress_callback)
+            else:
+                # Sequential download: hash chunks as they arrive.
+                hasher = hashlib.sha256() if model_info.sha256 else None
+                self._download_stream(url, temp_path, progress_callback, hasher)
+                if hasher is not None:
+                    file_hash = hasher.hexdigest()
             
             # Validate if sha256 available
-            if model_info.get("sha256"):
-                if progress_callback:
-                    progress_callback(0.99, "Validating checksum...")
+            if model_info.sha256:
+                if file_hash is None:
+                    if progress_callback:
+                        progress_callback(0.99, "Validating checksum...")
+                    file_hash = self._compute_sha256(temp_path)
                 
-                file_hash = self._compute_sha256(temp_path)
-                if file_hash != model_info["sha256"]:
+                if file_hash != model_info.sha256:
                     temp_path.unlink()
                     raise ValueError("Checksum mismatch - download corrupted")
             
             # Move to final location
-            shutil.move(str(temp_path), str(target_path))
+            # The temp file sits next to the target, so this is a rename.
+            os.replace(temp_path, target_path)
+            self._invalidate_local_models()
             
             # Update registry
             self.registry["models"].append({
@@ -147,11 +211,111 @@ class ModelManager:
                 temp_path.unlink()
             raise RuntimeError(f"Download failed: {e}")
     
+    def _probe_download(self, url: str) -> Tuple[int, bool]:
+        """Return (content length, byte-range support) for a download URL."""
+        import httpx
+        
+        try:
+            response = self._client().head(url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return 0, False
+        total_size = int(response.headers.get('content-length', 0))
+        ranged = response.headers.get('accept-ranges', '').lower() == 'bytes'
+        return total_size, ranged
+    
+    def _report_download(self, progress_callback, downloaded: int, total_size: int):
+        """Forward download progress to the caller's callback."""
+        if total_size and progress_callback:
+            progress = downloaded / total_size
+            progress_callback(progress, f"Downloading: {downloaded / (1024*1024):.1f} MB / {total_size / (1024*1024):.1f} MB")
+    
+    @staticmethod
+    def _preallocate(f, size: int):
+        """Reserve size bytes for f up front so the file is not grown per chunk."""
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+                return
+            except OSError:
+                pass
+        f.truncate(size)
+    
+    def _download_stream(self, url: str, temp_path: Path, progress_callback, hasher=None):
+        """Download over a single streamed connection, feeding hasher if given."""
+        with self._client().stream("GET", url) as response:
+            response.raise_for_status()
+            
+            total_size = int(response.headers.get('content-length', 0))
+            downloaded = 0
+            
+            # Unbuffered: each multi-MiB chunk goes straight to a single write().
+            with open(temp_path, 'wb', buffering=0) as f:
+                if total_size:
+                    self._preallocate(f, total_size)
+                for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    self._report_download(progress_callback, downloaded, total_size)
+                if downloaded != total_size:
+                    f.truncate(downloaded)
+    
+    def _download_ranged(self, url: str, temp_path: Path, total_size: int, progress_callback):
+        """Download over parallel HTTP range requests into a preallocated file.
+        
+        Each worker writes its own byte range through a separate handle;
+        progress is reported from the calling thread only.
+        """
+        with open(temp_path, 'wb', buffering=0) as f:
+            self._preallocate(f, total_size)
+        
+        part = -(-total_size // DOWNLOAD_CONNECTIONS)
+        ranges = [(lo, min(lo + part, total_size) - 1) for lo in range(0, total_size, part)]
+        downloaded = [0]
+        lock = threading.Lock()
+        failed = threading.Event()
+        
+        def fetch(lo: int, hi: int):
+            received = 0
+            headers = {"Range": f"bytes={lo}-{hi}"}
+            with client.stream("GET", url, headers=headers) as response:
+                if response.status_code != 206:
+                    raise RuntimeError(f"Range request not honoured (HTTP {response.status_code})")
+                with open(temp_path, 'r+b', buffering=0) as f:
+                    f.seek(lo)
+                    for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        if failed.is_set():
+                            return
+                        f.write(chunk)
+                        received += len(chunk)
+                        with lock:
+                            downloaded[0] += len(chunk)
+            if received != hi - lo + 1:
+                raise RuntimeError(f"Incomplete range {lo}-{hi}: got {received} bytes")
+        
+        client = self._client()
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            pending = {pool.submit(fetch, lo, hi) for lo, hi in ranges}
+            try:
+                while pending:
+                    done, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+                    for future in done:
+                        future.result()
+                    self._report_download(progress_callback, downloaded[0], total_size)
+            except BaseException:
+                failed.set()
+                raise
+    
     def _compute_sha256(self, filepath: Path) -> str:
         """Compute SHA256 hash of file."""
-        sha256 = hashlib.sha256()
         with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(65536), b''):
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+: hashing loop runs in C without the GIL.
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            sha256 = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
                 sha256.update(chunk)
         return sha256.hexdigest()
     
@@ -163,6 +327,7 @@ class ModelManager:
         
         self.registry["active_model"] = str(path)
         self._save_registry()
+        self._invalidate_local_models()
     
     def get_active_model(self) -> Optional[Path]:
         """Get the currently active model path."""
@@ -182,6 +347,7 @@ class ModelManager:
         path = Path(model_path)
         if path.exists() and path.parent == self.models_dir:
             path.unlink()
+            self._invalidate_local_models()
             
             # Update registry
             self.registry["models"] = [
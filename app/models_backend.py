@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import queue
 import threading
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from .config import load_config, ROOT
 
-try:
-    from gpt4all import GPT4All
-except Exception as e:  # pragma: no cover
-    GPT4All = None  # type: ignore
+# Imported on first ModelBackend() by _load_gpt4all(): the gpt4all native
+# backend (and its GPU probing) is slow to load and most imports never need it.
+GPT4All = None  # type: ignore
+
+
+def _load_gpt4all():
+    """Import and cache the GPT4All class, or return None if unavailable."""
+    global GPT4All
+    if GPT4All is None:
+        try:
+            from gpt4all import GPT4All as _GPT4All
+        except Exception:  # pragma: no cover
+            return None
+        GPT4All = _GPT4All
+    return GPT4All
 
 
 class ModelBackend:
@@ -17,6 +30,10 @@ class ModelBackend:
 
     For now we use GPT4All instead of llama-cpp-python on Windows to avoid
     compiler issues while still running Qwen/TinyLlama locally.
+
+    The GPT4All model is not safe to drive from several threads, so every
+    generate() call is queued and served FIFO by a single worker thread that
+    owns the model.
     """
 
     _instance_lock = threading.Lock()
@@ -27,7 +44,7 @@ class ModelBackend:
         self.config = cfg
         model_rel = cfg.get("model_path") or "models/qwen2.5-7b-instruct-q5_k_m-00001-of-00002.gguf"
         self.model_path = (ROOT / model_rel).resolve()
-        if GPT4All is None:
+        if _load_gpt4all() is None:
             raise RuntimeError("gpt4all is not installed; install with `pip install gpt4all` in the venv.")
 
         if not self.model_path.exists():
@@ -36,6 +53,10 @@ class ModelBackend:
         # GPT4All expects model name and optional model_path directory
         self._model = GPT4All(self.model_path.name, model_path=str(self.model_path.parent))
 
+        self._requests: "queue.Queue[Tuple[str, int, float, Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="model-backend", daemon=True)
+        self._worker.start()
+
     @classmethod
     def instance(cls) -> "ModelBackend":
         with cls._instance_lock:
@@ -48,6 +69,22 @@ class ModelBackend:
         max_toks = max_tokens or int(cfg.get("max_tokens", 512))
         temp = float(temperature if temperature is not None else cfg.get("temperature", 0.6))
 
-        with self._model.chat_session():
-            out = self._model.generate(prompt, max_tokens=max_toks, temp=temp)
-        return out.strip()
+        future: Future = Future()
+        self._requests.put((prompt, max_toks, temp, future))
+        return future.result()
+
+    def _run(self) -> None:
+        """Serve queued generate() requests back-to-back on the model."""
+        while True:
+            prompt, max_toks, temp, future = self._requests.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                # Fresh session per request so one caller's history never
+                # leaks into another's prompt.
+                with self._model.chat_session():
+                    out = self._model.generate(prompt, max_tokens=max_toks, temp=temp)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(out.strip())
@@ -1,12 +1,18 @@
 """Task scheduler for GoodBoy.AI - Alfred's domain."""
-import json
+import atexit
+import heapq
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Tuple
 import threading
 import time
 from enum import Enum
 
+from .json_utils import dumps, loads, write_atomic
+
 class TaskPriority(Enum):
     LOW = 1
     MEDIUM = 2
@@ -20,42 +26,40 @@ class TaskStatus(Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
 
+def _to_datetime(value) -> datetime:
+    """Stored time -> datetime; files written before epoch storage hold ISO strings."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value)
+
+@dataclass(slots=True, eq=False)
 class ScheduledTask:
     """Represents a scheduled task."""
     
-    def __init__(
-        self,
-        task_id: str,
-        title: str,
-        description: str,
-        scheduled_time: datetime,
-        priority: TaskPriority = TaskPriority.MEDIUM,
-        recurring: Optional[str] = None,  # daily, weekly, monthly
-        callback: Optional[str] = None  # Agent to notify
-    ):
-        self.task_id = task_id
-        self.title = title
-        self.description = description
-        self.scheduled_time = scheduled_time
-        self.priority = priority
-        self.recurring = recurring
-        self.callback = callback
-        self.status = TaskStatus.PENDING
-        self.created_at = datetime.now()
-        self.completed_at = None
+    task_id: str
+    title: str
+    description: str
+    scheduled_time: datetime
+    priority: TaskPriority = TaskPriority.MEDIUM
+    recurring: Optional[str] = None  # daily, weekly, monthly
+    callback: Optional[str] = None  # Agent to notify
+    status: TaskStatus = field(default=TaskStatus.PENDING, init=False)
+    created_at: datetime = field(default_factory=datetime.now, init=False)
+    completed_at: Optional[datetime] = field(default=None, init=False)
     
     def to_dict(self) -> Dict:
+        # Times are stored as epoch floats; ISO strings only appear in summaries.
         return {
             "task_id": self.task_id,
             "title": self.title,
             "description": self.description,
-            "scheduled_time": self.scheduled_time.isoformat(),
+            "scheduled_time": self.scheduled_time.timestamp(),
             "priority": self.priority.value,
             "recurring": self.recurring,
             "callback": self.callback,
             "status": self.status.value,
-            "created_at": self.created_at.isoformat(),
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None
+            "created_at": self.created_at.timestamp(),
+            "completed_at": self.completed_at.timestamp() if self.completed_at else None
         }
     
     @classmethod
@@ -64,44 +68,129 @@ class ScheduledTask:
             task_id=data["task_id"],
             title=data["title"],
             description=data["description"],
-            scheduled_time=datetime.fromisoformat(data["scheduled_time"]),
+            scheduled_time=_to_datetime(data["scheduled_time"]),
             priority=TaskPriority(data["priority"]),
             recurring=data.get("recurring"),
             callback=data.get("callback")
         )
         task.status = TaskStatus(data["status"])
-        task.created_at = datetime.fromisoformat(data["created_at"])
+        task.created_at = _to_datetime(data["created_at"])
         if data.get("completed_at"):
-            task.completed_at = datetime.fromisoformat(data["completed_at"])
+            task.completed_at = _to_datetime(data["completed_at"])
         return task
 
 
 class Scheduler:
-    """Task scheduler with persistence."""
+    """Task scheduler with persistence.
+    
+    Pending tasks are indexed by a min-heap of (deadline, task_id), where the
+    deadline is scheduled_time as an epoch float compared against time.time().
+    Entries are never removed on cancel/complete; stale ones (task no longer
+    pending) are skipped and dropped lazily when they reach the root.
+    
+    The background loop sleeps on a condition variable until the earliest
+    deadline; add/cancel/stop notify it so it re-evaluates immediately.
+    """
+    
+    # Upper bound on a single deadline wait, so wall-clock adjustments are
+    # picked up eventually. Idle waits (no pending tasks) are unbounded.
+    MAX_WAIT_SECONDS = 300.0
+    # Mutations mark the task list dirty; it is written at most once per
+    # SAVE_DELAY seconds, plus on stop and at exit.
+    SAVE_DELAY = 0.5
+    # Handlers run on a small pool so one slow callback cannot hold up other
+    # due tasks or the loop's next wait.
+    MAX_HANDLER_WORKERS = 4
     
     def __init__(self, data_dir: Path):
         self.data_dir = data_dir
         self.tasks_file = data_dir / "scheduled_tasks.json"
         self.tasks: List[ScheduledTask] = self._load_tasks()
+        self._by_id: Dict[str, ScheduledTask] = {t.task_id: t for t in self.tasks}
+        self._pending_heap: List[Tuple[float, str]] = [
+            self._heap_entry(t) for t in self.tasks
+            if t.status == TaskStatus.PENDING
+        ]
+        heapq.heapify(self._pending_heap)
+        self._status_counts = Counter(t.status for t in self.tasks)
+        # Guards task state and wakes the scheduler loop. Reentrant, since
+        # complete_task() adds the next recurrence via add_task().
+        self._cv = threading.Condition(threading.RLock())
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._io_lock = threading.Lock()
+        atexit.register(self.flush, fsync=True)
         self._running = False
         self._thread = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._task_handlers: Dict[str, Callable] = {}
     
     def _load_tasks(self) -> List[ScheduledTask]:
         """Load tasks from storage."""
         if self.tasks_file.exists():
             try:
-                with open(self.tasks_file, 'r') as f:
-                    data = json.load(f)
+                data = loads(self.tasks_file.read_bytes())
                 return [ScheduledTask.from_dict(t) for t in data]
             except Exception:
                 pass
         return []
     
-    def _save_tasks(self):
-        """Save tasks to storage."""
-        with open(self.tasks_file, 'w') as f:
-            json.dump([t.to_dict() for t in self.tasks], f, indent=2)
+    def _set_status(self, task: ScheduledTask, status: TaskStatus):
+        """Change a task's status, keeping the summary counters in step."""
+        self._status_counts[task.status] -= 1
+        self._status_counts[status] += 1
+        task.status = status
+    
+    @staticmethod
+    def _heap_entry(task: ScheduledTask) -> Tuple[float, str]:
+        # Wall-clock epoch seconds rather than time.monotonic(): tasks are due
+        # at a calendar time, and the monotonic clock stops during suspend.
+        return (task.scheduled_time.timestamp(), task.task_id)
+    
+    def _is_pending_entry(self, entry: Tuple[float, str]) -> bool:
+        """Whether a heap entry still refers to a pending task."""
+        task = self._by_id.get(entry[1])
+        return task is not None and task.status == TaskStatus.PENDING
+    
+    def _prune_heap(self):
+        """Drop stale entries from the top of the heap. Caller holds self._cv."""
+        heap = self._pending_heap
+        while heap and not self._is_pending_entry(heap[0]):
+            heapq.heappop(heap)
+    
+    def _mark_dirty(self):
+        """Record unsaved changes and schedule a debounced flush()."""
+        with self._cv:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush(self, fsync: bool = False):
+        """Write the task list to storage now if it has unsaved changes.
+        
+        The file is compact JSON replaced atomically; ``fsync`` additionally
+        forces it to disk and is only used on shutdown. See export() for a
+        readable copy.
+        """
+        # _io_lock is taken first so snapshots reach the disk in order.
+        with self._io_lock:
+            with self._cv:
+                timer, self._save_timer = self._save_timer, None
+                if timer is not None:
+                    timer.cancel()
+                if not self._dirty:
+                    return
+                data = dumps([t.to_dict() for t in self.tasks])
+                self._dirty = False
+            write_atomic(self.tasks_file, data, fsync=fsync)
+    
+    def export(self, path: Path):
+        """Write an indented copy of the task list to ``path``."""
+        with self._cv:
+            data = dumps([t.to_dict() for t in self.tasks], indent=True)
+        path.write_bytes(data)
     
     def add_task(
         self,
@@ -123,37 +212,62 @@ class Scheduler:
             recurring=recurring,
             callback=callback
         )
-        self.tasks.append(task)
-        self._save_tasks()
+        with self._cv:
+            self.tasks.append(task)
+            self._by_id[task.task_id] = task
+            self._status_counts[task.status] += 1
+            heapq.heappush(self._pending_heap, self._heap_entry(task))
+            self._mark_dirty()
+            self._cv.notify()
         return task
     
     def get_pending_tasks(self) -> List[ScheduledTask]:
         """Get all pending tasks sorted by time."""
-        pending = [t for t in self.tasks if t.status == TaskStatus.PENDING]
-        return sorted(pending, key=lambda t: t.scheduled_time)
+        with self._cv:
+            self._prune_heap()
+            return [
+                self._by_id[entry[1]] for entry in sorted(self._pending_heap)
+                if self._is_pending_entry(entry)
+            ]
     
     def get_due_tasks(self) -> List[ScheduledTask]:
-        """Get tasks that are due now."""
-        now = datetime.now()
-        return [
-            t for t in self.tasks 
-            if t.status == TaskStatus.PENDING and t.scheduled_time <= now
-        ]
+        """Get tasks that are due now, earliest first.
+        
+        Due entries form a subtree at the top of the heap (a parent is never
+        later than its children), so only that subtree is visited.
+        """
+        now = time.time()
+        with self._cv:
+            self._prune_heap()
+            heap = self._pending_heap
+            due = []
+            stack = [0] if heap and heap[0][0] <= now else []
+            while stack:
+                i = stack.pop()
+                if self._is_pending_entry(heap[i]):
+                    due.append(heap[i])
+                for child in (2 * i + 1, 2 * i + 2):
+                    if child < len(heap) and heap[child][0] <= now:
+                        stack.append(child)
+            due.sort()
+            return [self._by_id[task_id] for _, task_id in due]
     
     def complete_task(self, task_id: str) -> bool:
         """Mark a task as completed."""
-        for task in self.tasks:
-            if task.task_id == task_id:
-                task.status = TaskStatus.COMPLETED
-                task.completed_at = datetime.now()
-                
-                # Handle recurring tasks
-                if task.recurring:
-                    self._schedule_next_recurrence(task)
-                
-                self._save_tasks()
-                return True
-        return False
+        with self._cv:
+            task = self._by_id.get(task_id)
+            if task is None:
+                return False
+            
+            self._set_status(task, TaskStatus.COMPLETED)
+            task.completed_at = datetime.now()
+            
+            # Handle recurring tasks
+            if task.recurring:
+                self._schedule_next_recurrence(task)
+            
+            self._mark_dirty()
+        return True
     
     def _schedule_next_recurrence(self, task: ScheduledTask):
         """Schedule next occurrence of a recurring task."""
@@ -177,12 +291,15 @@ class Scheduler:
     
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a task."""
-        for task in self.tasks:
-            if task.task_id == task_id:
-                task.status = TaskStatus.CANCELLED
-                self._save_tasks()
-                return True
-        return False
+        with self._cv:
+            task = self._by_id.get(task_id)
+            if task is None:
+                return False
+            
+            self._set_status(task, TaskStatus.CANCELLED)
+            self._mark_dirty()
+            self._cv.notify()
+        return True
     
     def register_handler(self, callback_name: str, handler: Callable):
         """Register a handler for task callbacks."""
@@ -194,40 +311,94 @@ class Scheduler:
             return
         
         self._running = True
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_HANDLER_WORKERS, thread_name_prefix="sched"
+        )
         self._thread = threading.Thread(target=self._scheduler_loop, daemon=True)
         self._thread.start()
     
     def stop_scheduler(self):
         """Stop the background scheduler."""
-        self._running = False
+        with self._cv:
+            self._running = False
+            self._cv.notify_all()
         if self._thread:
             self._thread.join(timeout=2)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self.flush(fsync=True)
     
     def _scheduler_loop(self):
-        """Background loop to check for due tasks."""
-        while self._running:
-            due_tasks = self.get_due_tasks()
-            for task in due_tasks:
-                task.status = TaskStatus.IN_PROGRESS
-                
-                # Execute callback if registered
-                if task.callback and task.callback in self._task_handlers:
-                    try:
-                        self._task_handlers[task.callback](task)
-                    except Exception:
-                        task.status = TaskStatus.FAILED
-                        continue
-                
-                self.complete_task(task.task_id)
+        """Background loop: sleep until the next deadline, then run due tasks."""
+        while True:
+            with self._cv:
+                if not self._running:
+                    return
+                self._prune_heap()
+                if not self._pending_heap:
+                    self._cv.wait()
+                    continue
+                delay = self._pending_heap[0][0] - time.time()
+                if delay > 0:
+                    self._cv.wait(timeout=min(delay, self.MAX_WAIT_SECONDS))
+                    continue
+                due_tasks = self.get_due_tasks()
+                for task in due_tasks:
+                    self._set_status(task, TaskStatus.IN_PROGRESS)
+                # stop_scheduler() may clear self._executor once the lock is released.
+                executor = self._executor
             
-            time.sleep(60)  # Check every minute
+            # Handlers run on the executor, without the lock, so they may add
+            # or cancel tasks; _finalize records the outcome.
+            for task in due_tasks:
+                handler = self._task_handlers.get(task.callback) if task.callback else None
+                if handler is None:
+                    self.complete_task(task.task_id)
+                    continue
+                try:
+                    future = executor.submit(handler, task)
+                except RuntimeError:
+                    # The pool was shut down after this batch was taken.
+                    self._requeue(task)
+                    continue
+                future.add_done_callback(lambda f, task=task: self._finalize(task, f))
+    
+    def _requeue(self, task: ScheduledTask):
+        """Return an IN_PROGRESS task whose handler never ran to pending."""
+        with self._cv:
+            self._set_status(task, TaskStatus.PENDING)
+            # Its old entry may not have been pruned yet; a linear check is
+            # fine on this shutdown-only path and avoids a duplicate.
+            entry = self._heap_entry(task)
+            if entry not in self._pending_heap:
+                heapq.heappush(self._pending_heap, entry)
+            self._mark_dirty()
+    
+    def _finalize(self, task: ScheduledTask, future: Future):
+        """Record the outcome of a handler run."""
+        with self._cv:
+            if future.cancelled():
+                # Shut down before it ran: keep it pending for the next start.
+                self._requeue(task)
+                return
+            if future.exception() is not None:
+                self._set_status(task, TaskStatus.FAILED)
+                self._mark_dirty()
+                return
+        self.complete_task(task.task_id)
     
     def get_summary(self) -> Dict:
         """Get scheduler summary."""
-        return {
-            "total_tasks": len(self.tasks),
-            "pending": len([t for t in self.tasks if t.status == TaskStatus.PENDING]),
-            "completed": len([t for t in self.tasks if t.status == TaskStatus.COMPLETED]),
-            "failed": len([t for t in self.tasks if t.status == TaskStatus.FAILED]),
-            "next_due": self.get_pending_tasks()[0].scheduled_time.isoformat() if self.get_pending_tasks() else None
-        }
+        with self._cv:
+            self._prune_heap()
+            return {
+                "total_tasks": len(self.tasks),
+                "pending": self._status_counts[TaskStatus.PENDING],
+                "completed": self._status_counts[TaskStatus.COMPLETED],
+                "failed": self._status_counts[TaskStatus.FAILED],
+                "next_due": (
+                    self._by_id[self._pending_heap[0][1]].scheduled_time.isoformat()
+                    if self._pending_heap else None
+                )
+            }
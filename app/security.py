@@ -1,46 +1,71 @@
 """Security layer for GoodBoy.AI."""
-from typing import Optional, Dict, Any
+from collections import deque
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
 import hashlib
 from datetime import datetime
 
+from .clock import now_iso
+from .config import ROOT
+from .jsonl_writer import get_writer
+
+AUDIT_LOG_PATH = ROOT / "logs" / "security_audit.jsonl"
+
 class SecurityManager:
     """Manages security, permissions, and action validation."""
     
     # Safe tools that can run without explicit confirmation
-    SAFE_TOOLS = {
+    SAFE_TOOLS = frozenset({
         "code_review", "memory_search", "suggest_refactor", 
         "format_code", "lint_check"
-    }
+    })
     
     # Dangerous operations requiring approval
-    DANGEROUS_OPERATIONS = {
+    DANGEROUS_OPERATIONS = frozenset({
         "delete_files", "system_command", "modify_core", 
         "export_data", "reset_state"
-    }
+    })
+    
+    # One lookup per check: True = known safe, False = blocked.
+    # Tools in neither set are allowed without an audit entry.
+    _VERDICT: Mapping[str, bool] = MappingProxyType({
+        **{tool: True for tool in SAFE_TOOLS},
+        **{tool: False for tool in DANGEROUS_OPERATIONS}
+    })
     
-    def __init__(self):
-        self.audit_log = []
+    # Recent audit events kept in memory; the full trail is on disk.
+    AUDIT_MEMORY_LIMIT = 4096
+    
+    def __init__(self, audit_file: Optional[Path] = AUDIT_LOG_PATH):
+        self.audit_log = deque(maxlen=self.AUDIT_MEMORY_LIMIT)
+        self.audit_file = audit_file
+        self._writer = None
+        if audit_file is not None:
+            audit_file.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = get_writer()
     
     def can_execute(self, tool_name: str, context: Optional[Dict] = None) -> bool:
         """Check if tool can be executed safely."""
-        if tool_name in self.SAFE_TOOLS:
-            self._log_action("execute", tool_name, "approved")
+        verdict = self._VERDICT.get(tool_name)
+        if verdict is None:
             return True
         
-        if tool_name in self.DANGEROUS_OPERATIONS:
-            self._log_action("execute", tool_name, "blocked")
-            return False
-        
-        return True
+        self._log_action("execute", tool_name, "approved" if verdict else "blocked")
+        return verdict
     
     def _log_action(self, action: str, target: str, result: str):
         """Log security events."""
-        self.audit_log.append({
-            "timestamp": datetime.now().isoformat(),
+        event = {
+            "timestamp": now_iso(),
             "action": action,
             "target": target,
             "result": result
-        })
+        }
+        self.audit_log.append(event)
+        if self._writer is not None:
+            # Batched: the writer thread appends queued events in one write.
+            self._writer.append(self.audit_file, event)
 
 class ValidationManager:
     """Validates agent outputs and suggested actions."""
@@ -58,6 +83,10 @@ class ValidationManager:
             return False
         return True
 
+def _short_digest(text: str) -> str:
+    """8-hex-char tag for correlating audit entries (not a security hash)."""
+    return hashlib.blake2b(text.encode("utf-8", "replace"), digest_size=4).hexdigest()
+
 class AuditLogger:
     """Comprehensive audit logging."""
     
@@ -68,8 +97,8 @@ class AuditLogger:
         """Log interaction to audit trail."""
         entry = {
             "timestamp": datetime.now().isoformat(),
-            "message_hash": hashlib.sha256(message.encode()).hexdigest()[:8],
+            "message_hash": _short_digest(message),
             "agents": agents,
-            "result_hash": hashlib.sha256(result.encode()).hexdigest()[:8]
+            "result_hash": _short_digest(result)
         }
         return entry
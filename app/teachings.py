@@ -6,13 +6,16 @@ backend or offline fine-tuning pipelines later.
 """
 from __future__ import annotations
 
-import json
+import heapq
+import re
+from collections import Counter
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from .config import ROOT
+from .json_utils import dumps_line, iter_jsonl
 from .logging_utils import get_logger
 
 log = get_logger(__name__)
@@ -20,8 +23,17 @@ log = get_logger(__name__)
 DATA_DIR = ROOT / "data"
 LESSONS_PATH = DATA_DIR / "teachings.jsonl"
 
+_WORD_RE = re.compile(r"\w{3,}")
+# Query words found in a lesson's topic or tags count this much more than
+# words found only in its instruction.
+_TOPIC_WEIGHT = 2
 
-@dataclass
+
+def _tokens(text: str) -> Set[str]:
+    return set(_WORD_RE.findall(text.lower()))
+
+
+@dataclass(slots=True)
 class Teaching:
     """A single owner-provided lesson.
 
@@ -42,6 +54,48 @@ class TeachingStore:
     def __init__(self) -> None:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
         self.path = LESSONS_PATH
+        # Built on the first get_relevant_lessons() call, then kept in step
+        # by add_lesson(): token -> [(lesson index, weight), ...].
+        self._lessons: Optional[List[Teaching]] = None
+        self._token_idx: Dict[str, List[Tuple[int, int]]] = {}
+
+    def _index_lesson(self, lesson: Teaching) -> None:
+        i = len(self._lessons)
+        self._lessons.append(lesson)
+        key_tokens = _tokens(lesson.topic) | _tokens(" ".join(lesson.tags))
+        for token in key_tokens | _tokens(lesson.instruction):
+            weight = _TOPIC_WEIGHT if token in key_tokens else 1
+            self._token_idx.setdefault(token, []).append((i, weight))
+
+    def _ensure_index(self) -> None:
+        if self._lessons is not None:
+            return
+        self._lessons = []
+        self._token_idx = {}
+        for d in self.load_all():
+            self._index_lesson(
+                Teaching(
+                    topic=str(d.get("topic", "")),
+                    instruction=str(d.get("instruction", "")),
+                    tags=list(d.get("tags") or []),
+                    created_at=str(d.get("created_at", "")),
+                )
+            )
+
+    def get_relevant_lessons(self, query: str, k: int = 3) -> List[Teaching]:
+        """Return up to k lessons sharing the most words with query.
+
+        Scores come from the inverted index, so only lessons containing at
+        least one query word are touched. Ties go to the newer lesson.
+        """
+
+        self._ensure_index()
+        scores: Counter = Counter()
+        for token in _tokens(query):
+            for i, weight in self._token_idx.get(token, ()):
+                scores[i] += weight
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], item[0]))
+        return [self._lessons[i] for i, _ in best]
 
     def add_lesson(self, topic: str, instruction: str, tags: Optional[List[str]] = None) -> Teaching:
         lesson = Teaching(
@@ -50,21 +104,15 @@ class TeachingStore:
             tags=tags or [],
             created_at=datetime.now(timezone.utc).isoformat(),
         )
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(lesson.to_dict(), ensure_ascii=False) + "\n")
+        with self.path.open("ab") as f:
+            f.write(dumps_line(lesson.to_dict()))
+        if self._lessons is not None:
+            self._index_lesson(lesson)
         log.info("Teaching added", extra={"topic": topic, "tags": tags or []})
         return lesson
 
     def load_all(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        if not self.path.exists():
-            return []
-        out: List[Dict[str, Any]] = []
-        with self.path.open("r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    out.append(json.loads(line))
-                except Exception:
-                    continue
+        out: List[Dict[str, Any]] = list(iter_jsonl(self.path))
         if limit is not None:
             return out[-limit:]
         return out
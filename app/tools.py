@@ -1,19 +1,27 @@
 from __future__ import annotations
 
-import json
+import ast
+import errno
+import fnmatch
 import os
+import re
 import shutil
 import subprocess
 import sys
 import textwrap
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
+from .clock import utc_now_iso
 from .config import ROOT, load_config
+from .json_utils import loads
+from .jsonl_writer import get_writer
 from .logging_utils import get_logger
 
+_ROOT_STR = str(ROOT)
 LOG_DIR = ROOT / "logs"
 ACTIONS_LOG = LOG_DIR / "actions.log"
 TOOLS_REGISTRY_PATH = ROOT / "data" / "tools_registry.json"
@@ -31,86 +39,147 @@ class ToolResult:
     data: Dict[str, Any]
 
 
-SAFE_SUBPROCESS_WHITELIST = {"dir", "type", "python", "pip", "git", "pytest", "ffmpeg"}
+SAFE_SUBPROCESS_WHITELIST = frozenset({"dir", "type", "python", "pip", "git", "pytest", "ffmpeg"})
+# Whitelisted commands that only exist inside cmd.exe.
+_SHELL_BUILTINS = frozenset({"dir", "type"})
+# Anything the shell would interpret (pipes, redirects, quoting, globs,
+# variables). Commands without it are run directly from their split argv.
+_SHELL_SYNTAX_RE = re.compile(
+    r"[|&;<>()$`'\"*?\[\]{}~%^!\n]" + ("" if os.name == "nt" else r"|\\")
+)
 
 
 def _log_action(entry: Dict[str, Any]) -> None:
-    entry["timestamp"] = datetime.utcnow().isoformat() + "Z"
-    ACTIONS_LOG.parent.mkdir(parents=True, exist_ok=True)
-    with ACTIONS_LOG.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    entry["timestamp"] = utc_now_iso("Z")
+    # Batched with other JSONL appends; LOG_DIR is created at import time.
+    get_writer().append(ACTIONS_LOG, entry)
+
+
+def _resolve(path: str) -> str:
+    """Absolute paths pass through; relative ones are taken from ROOT."""
+
+    return path if os.path.isabs(path) else os.path.join(_ROOT_STR, path)
 
 
 # --- Tool implementations ---
 
 
 def read_file(path: str) -> ToolResult:
-    p = (ROOT / path) if not os.path.isabs(path) else Path(path)
+    p = _resolve(path)
     try:
-        text = p.read_text(encoding="utf-8")
+        with open(p, encoding="utf-8") as f:
+            text = f.read()
         detail = f"Read {len(text)} characters from {p}"
         ok = True
-        data = {"path": str(p), "content": text}
+        data = {"path": p, "content": text}
     except Exception as e:  # pragma: no cover - filesystem errors
         detail = f"read_file failed: {e}"
         ok = False
-        data = {"path": str(p)}
-    _log_action({"tool": "read_file", "ok": ok, "detail": detail, "path": str(p)})
+        data = {"path": p}
+    _log_action({"tool": "read_file", "ok": ok, "detail": detail, "path": p})
     return ToolResult("read_file", ok, detail, data)
 
 
-def _make_backup(path: Path) -> str:
+def _make_backup(path: str, existing: bytes) -> str:
+    """Save `existing` (the file's current bytes, already read) as a backup."""
+
     ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    backup_dir = ROOT / "backups"
-    backup_dir.mkdir(parents=True, exist_ok=True)
-    backup_path = backup_dir / f"{path.name}.{ts}.bak"
-    if path.exists():
-        shutil.copy2(path, backup_path)
-    return str(backup_path)
+    backup_dir = os.path.join(_ROOT_STR, "backups")
+    os.makedirs(backup_dir, exist_ok=True)
+    backup_path = os.path.join(backup_dir, f"{os.path.basename(path)}.{ts}.bak")
+    with open(backup_path, "wb") as f:
+        f.write(existing)
+    return backup_path
 
 
 def write_file(path: str, content: str) -> ToolResult:
-    p = (ROOT / path) if not os.path.isabs(path) else Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    backup_path = _make_backup(p)
+    p = _resolve(path)
+    # Same bytes text mode would write (newlines translated to os.linesep).
+    data = (content if os.linesep == "\n" else content.replace("\n", os.linesep)).encode("utf-8")
+    try:
+        with open(p, "rb") as f:
+            existing = f.read()
+    except FileNotFoundError:
+        existing = None
+    if existing == data:
+        detail = f"{p} already has this content; nothing written"
+        _log_action({"tool": "write_file", "ok": True, "detail": detail, "path": p, "backup": None})
+        return ToolResult("write_file", True, detail, {"path": p, "backup": None})
+
+    os.makedirs(os.path.dirname(p), exist_ok=True)
+    # Only an existing file needs a backup, and its bytes are already in hand.
+    backup_path = _make_backup(p, existing) if existing is not None else None
     try:
-        p.write_text(content, encoding="utf-8")
+        with open(p, "wb") as f:
+            f.write(data)
         detail = f"Wrote {len(content)} characters to {p} (backup: {backup_path})"
         ok = True
     except Exception as e:  # pragma: no cover
         detail = f"write_file failed: {e} (backup: {backup_path})"
         ok = False
-    _log_action({"tool": "write_file", "ok": ok, "detail": detail, "path": str(p), "backup": backup_path})
-    return ToolResult("write_file", ok, detail, {"path": str(p), "backup": backup_path})
+    _log_action({"tool": "write_file", "ok": ok, "detail": detail, "path": p, "backup": backup_path})
+    return ToolResult("write_file", ok, detail, {"path": p, "backup": backup_path})
+
+
+# Bytes of stdout/stderr kept per run_subprocess call.
+SUBPROCESS_OUTPUT_LIMIT = 4000
+
+
+def _drain_head(stream, limit: int, out: List[bytes]) -> None:
+    """Read a pipe to EOF, keeping only its first `limit` bytes in `out`."""
+
+    kept = 0
+    with stream:
+        for chunk in iter(lambda: stream.read(8192), b""):
+            if kept < limit:
+                out.append(chunk[: limit - kept])
+                kept += len(out[-1])
+
+
+def _decode_output(chunks: List[bytes]) -> str:
+    # Only the kept head is decoded; a character cut at the limit is replaced.
+    return b"".join(chunks).decode("utf-8", "replace").replace("\r\n", "\n")
 
 
 def run_subprocess(command: str) -> ToolResult:
     # Very conservative: only allow commands whose first token is whitelisted.
-    tokens = command.strip().split()
-    if not tokens:
+    # Only that token is split off here; the full argv is built if needed.
+    head = command.split(None, 1)
+    if not head:
         return ToolResult("run_subprocess", False, "Empty command", {"command": command})
 
-    base = tokens[0].lower()
+    base = head[0].lower()
     if base not in SAFE_SUBPROCESS_WHITELIST:
         detail = f"Command '{base}' is not in whitelist."
         _log_action({"tool": "run_subprocess", "ok": False, "detail": detail, "command": command})
         return ToolResult("run_subprocess", False, detail, {"command": command})
 
+    # Plain commands skip the intermediate shell process entirely.
+    use_shell = base in _SHELL_BUILTINS or _SHELL_SYNTAX_RE.search(command) is not None
     try:
-        proc = subprocess.run(
-            command,
-            shell=True,
+        proc = subprocess.Popen(
+            command if use_shell else command.split(),
+            shell=use_shell,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            encoding="utf-8",
         )
-        ok = proc.returncode == 0
-        detail = f"Completed with return code {proc.returncode}"
+        # Both pipes are drained to EOF so the child never blocks on a full
+        # pipe, but only the head of each is kept in memory.
+        stdout: List[bytes] = []
+        stderr: List[bytes] = []
+        err_reader = threading.Thread(
+            target=_drain_head, args=(proc.stderr, SUBPROCESS_OUTPUT_LIMIT, stderr), daemon=True
+        )
+        err_reader.start()
+        _drain_head(proc.stdout, SUBPROCESS_OUTPUT_LIMIT, stdout)
+        err_reader.join()
+        returncode = proc.wait()
+        ok = returncode == 0
+        detail = f"Completed with return code {returncode}"
         data = {
             "command": command,
-            "stdout": proc.stdout[:4000],
-            "stderr": proc.stderr[:4000],
+            "stdout": _decode_output(stdout),
+            "stderr": _decode_output(stderr),
         }
     except Exception as e:  # pragma: no cover
         ok = False
@@ -144,21 +213,31 @@ def open_path(path: str) -> ToolResult:
     so it is guarded by Clerk's safety rules.
     """
 
-    p = (ROOT / path) if not os.path.isabs(path) else Path(path)
+    p = _resolve(path)
     try:
         if os.name == "nt":
-            os.startfile(str(p))  # type: ignore[attr-defined]
+            os.startfile(p)  # type: ignore[attr-defined]
         elif sys.platform == "darwin":
-            subprocess.Popen(["open", str(p)])
+            subprocess.Popen(["open", p])
         else:
-            subprocess.Popen(["xdg-open", str(p)])
+            subprocess.Popen(["xdg-open", p])
         detail = f"Opened {p} via OS handler"
         ok = True
     except Exception as e:  # pragma: no cover
         detail = f"open_path failed: {e}"
         ok = False
-    _log_action({"tool": "open_path", "ok": ok, "detail": detail, "path": str(p)})
-    return ToolResult("open_path", ok, detail, {"path": str(p)})
+    _log_action({"tool": "open_path", "ok": ok, "detail": detail, "path": p})
+    return ToolResult("open_path", ok, detail, {"path": p})
+
+
+DOWNLOAD_CATEGORIES = {
+    "Images": frozenset({".png", ".jpg", ".jpeg", ".gif", ".webp"}),
+    "Video": frozenset({".mp4", ".mov", ".mkv", ".avi"}),
+    "Audio": frozenset({".mp3", ".wav", ".flac", ".m4a"}),
+    "Docs": frozenset({".pdf", ".docx", ".pptx", ".xlsx", ".txt", ".md"}),
+}
+# Inverted once so each file costs a single lookup.
+_EXT_TO_CATEGORY = {ext: name for name, exts in DOWNLOAD_CATEGORIES.items() for ext in exts}
 
 
 def organize_downloads(root: str | None = None) -> ToolResult:
@@ -178,31 +257,39 @@ def organize_downloads(root: str | None = None) -> ToolResult:
         _log_action({"tool": "organize_downloads", "ok": False, "detail": detail, "root": str(base)})
         return ToolResult("organize_downloads", False, detail, {"root": str(base)})
 
-    mapping = {
-        "Images": {".png", ".jpg", ".jpeg", ".gif", ".webp"},
-        "Video": {".mp4", ".mov", ".mkv", ".avi"},
-        "Audio": {".mp3", ".wav", ".flac", ".m4a"},
-        "Docs": {".pdf", ".docx", ".pptx", ".xlsx", ".txt", ".md"},
-    }
+    # Collect first: files are moved into subfolders of the directory being
+    # listed. DirEntry.is_file()/is_dir() reuse the type from the listing, and
+    # category folders seen here need no mkdir call at all.
+    files = []
+    subdirs = set()
+    with os.scandir(base) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False):
+                files.append(entry)
+            elif entry.is_dir():
+                subdirs.add(entry.name)
 
     moved: List[Dict[str, str]] = []
-    for item in base.iterdir():
-        if not item.is_file():
-            continue
-        ext = item.suffix.lower()
-        target_dir_name = None
-        for name, exts in mapping.items():
-            if ext in exts:
-                target_dir_name = name
-                break
-        if target_dir_name is None:
-            target_dir_name = "Other"
-        target_dir = base / target_dir_name
-        target_dir.mkdir(exist_ok=True)
-        target_path = target_dir / item.name
+    base_str = str(base)
+    target_dirs: Dict[str, str] = {}
+    for entry in files:
+        ext = os.path.splitext(entry.name)[1].lower()
+        target_dir_name = _EXT_TO_CATEGORY.get(ext, "Other")
+        target_dir = target_dirs.get(target_dir_name)
+        if target_dir is None:
+            target_dir = target_dirs[target_dir_name] = os.path.join(base_str, target_dir_name)
+            if target_dir_name not in subdirs:
+                os.makedirs(target_dir, exist_ok=True)
+        target_path = os.path.join(target_dir, entry.name)
         try:
-            shutil.move(str(item), target_path)
-            moved.append({"from": str(item), "to": str(target_path)})
+            # Same directory tree, so normally a single rename.
+            try:
+                os.replace(entry.path, target_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(entry.path, target_path)
+            moved.append({"from": entry.path, "to": target_path})
         except Exception:
             continue
 
@@ -211,6 +298,60 @@ def organize_downloads(root: str | None = None) -> ToolResult:
     return ToolResult("organize_downloads", True, detail, {"root": str(base), "moved": moved})
 
 
+def _latest_match(base: Path, pattern: str) -> Path | None:
+    """Most recently modified file in base whose name matches pattern.
+
+    Plain name patterns are matched against os.scandir entries, which carry
+    their stat info, instead of building and stat-ing a Path per file.
+    """
+
+    if "/" in pattern or "\\" in pattern:
+        matches = [p for p in base.glob(pattern) if p.is_file()]
+        return max(matches, key=lambda p: p.stat().st_mtime, default=None)
+    # Translate the pattern once rather than per entry via fnmatch.fnmatch().
+    match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    latest = None
+    latest_mtime = None
+    with os.scandir(base) as entries:
+        for entry in entries:
+            if not match(os.path.normcase(entry.name)) or not entry.is_file():
+                continue
+            mtime = entry.stat().st_mtime
+            if latest_mtime is None or mtime > latest_mtime:
+                latest, latest_mtime = entry.path, mtime
+    return Path(latest) if latest is not None else None
+
+
+def _read_tail(path: Path, lines: int, block_size: int = 64 * 1024) -> str:
+    """Return the last `lines` lines of a file, reading backwards from the end."""
+
+    if lines <= 0:
+        return ""
+    blocks: List[bytes] = []
+    newlines = 0
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        # One extra newline guarantees the first kept line is complete.
+        while pos > 0 and newlines <= lines:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+    blocks.reverse()
+    data = b"".join(blocks)
+    # Decode only from the newline before the wanted lines (plus one spare
+    # for a trailing newline), not the whole tail of the last block.
+    cut = len(data)
+    for _ in range(lines + 1):
+        cut = data.rfind(b"\n", 0, cut)
+        if cut < 0:
+            break
+    text = data[cut + 1:].decode("utf-8", errors="ignore")
+    return "\n".join(text.splitlines()[-lines:])
+
+
 def tail_logs(directory: str, pattern: str = "*.log", lines: int = 200) -> ToolResult:
     """Return the tail of the latest log file in a directory.
 
@@ -223,16 +364,14 @@ def tail_logs(directory: str, pattern: str = "*.log", lines: int = 200) -> ToolR
         _log_action({"tool": "tail_logs", "ok": False, "detail": detail, "directory": str(base)})
         return ToolResult("tail_logs", False, detail, {"directory": str(base)})
 
-    candidates = sorted(base.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not candidates:
+    latest = _latest_match(base, pattern)
+    if latest is None:
         detail = f"No log files matching {pattern} in {base}"
         _log_action({"tool": "tail_logs", "ok": False, "detail": detail, "directory": str(base)})
         return ToolResult("tail_logs", False, detail, {"directory": str(base)})
 
-    latest = candidates[0]
     try:
-        text = latest.read_text(encoding="utf-8", errors="ignore")
-        tail = "\n".join(text.splitlines()[-lines:])
+        tail = _read_tail(latest, lines)
         detail = f"Read tail of {latest} ({lines} lines)"
         ok = True
         data = {"path": str(latest), "tail": tail}
@@ -245,17 +384,126 @@ def tail_logs(directory: str, pattern: str = "*.log", lines: int = 200) -> ToolR
     return ToolResult("tail_logs", ok, detail, data)
 
 
-TOOL_REGISTRY = {
-    "read_file": {"func": read_file, "destructive": False},
-    "write_file": {"func": write_file, "destructive": True},
-    "run_subprocess": {"func": run_subprocess, "destructive": True},
-    "open_url": {"func": open_url, "destructive": False},
-    "send_email": {"func": send_email_stub, "destructive": False},
-    "open_path": {"func": open_path, "destructive": True},
-    "organize_downloads": {"func": organize_downloads, "destructive": True},
-    "tail_logs": {"func": tail_logs, "destructive": False},
+def analyze_code(path: str) -> ToolResult:
+    """Summarize a source file: line count plus, for Python, its defs and imports.
+
+    Python files are parsed once with ast, which handles decorators,
+    multi-line signatures and nested or conditional definitions.
+    """
+
+    p = _resolve(path)
+    try:
+        with open(p, encoding="utf-8", errors="ignore") as f:
+            content = f.read()
+    except Exception as e:  # pragma: no cover - filesystem errors
+        detail = f"analyze_code failed: {e}"
+        _log_action({"tool": "analyze_code", "ok": False, "detail": detail, "path": p})
+        return ToolResult("analyze_code", False, detail, {"path": p})
+
+    analysis: Dict[str, Any] = {
+        "path": p,
+        "lines": content.count("\n") + (1 if content and not content.endswith("\n") else 0),
+        "functions": [],
+        "classes": [],
+        "imports": [],
+    }
+    if p.endswith(".py"):
+        try:
+            tree = ast.parse(content, filename=p)
+        except SyntaxError as e:
+            analysis["syntax_error"] = f"line {e.lineno}: {e.msg}"
+        else:
+            for node in ast.walk(tree):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    analysis["functions"].append({"name": node.name, "line": node.lineno})
+                elif isinstance(node, ast.ClassDef):
+                    analysis["classes"].append({"name": node.name, "line": node.lineno})
+                elif isinstance(node, ast.Import):
+                    analysis["imports"].extend(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom):
+                    module = "." * node.level + (node.module or "")
+                    analysis["imports"].append(f"from {module} import ...")
+            for key in ("functions", "classes"):
+                analysis[key].sort(key=lambda item: item["line"])
+
+    detail = (
+        f"{os.path.basename(p)}: {analysis['lines']} lines, {len(analysis['functions'])} functions, "
+        f"{len(analysis['classes'])} classes, {len(analysis['imports'])} imports"
+    )
+    _log_action({"tool": "analyze_code", "ok": True, "detail": detail, "path": p})
+    return ToolResult("analyze_code", True, detail, analysis)
+
+
+class Tool(NamedTuple):
+    func: Callable[..., ToolResult]
+    destructive: bool
+    # Maps the request's args dict to func's positional arguments; a missing
+    # required key raises KeyError. None marks a listed but non-executable
+    # tool (e.g. the data/tools_registry.json ones), which execute_tool refuses.
+    unpack: Optional[Callable[[Dict[str, Any]], Tuple[Any, ...]]] = None
+
+
+# Signatures are kept small on purpose.
+TOOL_REGISTRY: Dict[str, Tool] = {
+    "read_file": Tool(read_file, False, lambda a: (a["path"],)),
+    "write_file": Tool(write_file, True, lambda a: (a["path"], a.get("content", ""))),
+    "run_subprocess": Tool(run_subprocess, True, lambda a: (a["command"],)),
+    "open_url": Tool(open_url, False, lambda a: (a["url"],)),
+    "send_email": Tool(
+        send_email_stub, False, lambda a: (a["to"], a.get("subject", ""), a.get("body", ""))
+    ),
+    "open_path": Tool(open_path, True, lambda a: (a["path"],)),
+    "organize_downloads": Tool(organize_downloads, True, lambda a: (a.get("root"),)),
+    "tail_logs": Tool(
+        tail_logs,
+        False,
+        lambda a: (a["directory"], a.get("pattern", "*.log"), int(a.get("lines", 200))),
+    ),
+    "analyze_code": Tool(analyze_code, False, lambda a: (a["path"],)),
 }
 
+# Derived view of TOOL_REGISTRY, rebuilt lazily after register_tool().
+_available_cache: Optional[Tuple[str, ...]] = None
+# tools_prompt() text per allowed_tools tuple; independent of the registry.
+_prompt_cache: Dict[Tuple[str, ...], str] = {}
+
+
+def register_tool(
+    name: str,
+    func: Callable[..., ToolResult],
+    destructive: bool = False,
+    unpack: Optional[Callable[[Dict[str, Any]], Tuple[Any, ...]]] = None,
+) -> None:
+    """Add or replace a tool and drop the cached listing.
+
+    Without ``unpack`` the tool is listed but cannot be executed.
+    """
+    global _available_cache
+    # Interned so lookups with literal tool names match by identity.
+    TOOL_REGISTRY[sys.intern(name)] = Tool(func, destructive, unpack)
+    _available_cache = None
+
+
+def list_available() -> Tuple[str, ...]:
+    """Names of all registered tools, shared between callers."""
+    global _available_cache
+    if _available_cache is None:
+        _available_cache = tuple(TOOL_REGISTRY)
+    return _available_cache
+
+
+def tools_prompt(allowed: Iterable[str]) -> str:
+    """`allowed` joined with ", " for the planner prompt, memoised per list.
+
+    Names are kept as configured, registered or not, so the prompt matches
+    the plain join it replaces.
+    """
+    key = tuple(allowed)
+    text = _prompt_cache.get(key)
+    if text is None:
+        text = _prompt_cache[key] = ", ".join(key)
+    return text
+
 
 def _load_dynamic_tools() -> None:
     """Load additional tool definitions from data/tools_registry.json.
@@ -266,10 +514,10 @@ def _load_dynamic_tools() -> None:
     JSON file.
     """
 
-    if not TOOLS_REGISTRY_PATH.exists():
-        return
     try:
-        raw = json.loads(TOOLS_REGISTRY_PATH.read_text(encoding="utf-8"))
+        raw = loads(TOOLS_REGISTRY_PATH.read_bytes())
+    except FileNotFoundError:
+        return
     except Exception as e:  # pragma: no cover
         log.error("Failed to load tools_registry.json: %s", e)
         return
@@ -300,7 +548,7 @@ def _load_dynamic_tools() -> None:
 
                 return _fn
 
-            TOOL_REGISTRY[name] = {"func": make_func(command_template), "destructive": destructive}
+            register_tool(name, make_func(command_template), destructive)
         except Exception as e:  # pragma: no cover
             log.error("Error while registering dynamic tool: %s", e)
 
@@ -310,35 +558,19 @@ _load_dynamic_tools()
 
 
 def execute_tool(name: str, args: Dict[str, Any]) -> ToolResult:
-    meta = TOOL_REGISTRY.get(name)
-    if not meta:
+    tool = TOOL_REGISTRY.get(name)
+    if not tool:
         return ToolResult(name, False, f"Unknown tool: {name}", {})
+    if tool.unpack is None:
+        return ToolResult(name, False, "Unsupported tool invocation pattern", {})
 
-    func = meta["func"]
-    # Simple arg passing; we keep signatures small on purpose.
     try:
-        if name == "read_file":
-            return func(args["path"])
-        if name == "write_file":
-            return func(args["path"], args.get("content", ""))
-        if name == "run_subprocess":
-            return func(args["command"])
-        if name == "open_url":
-            return func(args["url"])
-        if name == "send_email":
-            return func(args["to"], args.get("subject", ""), args.get("body", ""))
-        if name == "open_path":
-            return func(args["path"])
-        if name == "organize_downloads":
-            return func(args.get("root"))
-        if name == "tail_logs":
-            return func(args["directory"], args.get("pattern", "*.log"), int(args.get("lines", 200)))
+        call_args = tool.unpack(args)
     except KeyError as e:
         return ToolResult(name, False, f"Missing argument: {e}", {})
-
-    return ToolResult(name, False, "Unsupported tool invocation pattern", {})
+    return tool.func(*call_args)
 
 
 def is_destructive(name: str) -> bool:
-    meta = TOOL_REGISTRY.get(name)
-    return bool(meta and meta.get("destructive"))
+    tool = TOOL_REGISTRY.get(name)
+    return bool(tool and tool.destructive)
@@ -6,13 +6,15 @@ inspect how Bathy is used and propose improvements.
 """
 from __future__ import annotations
 
+import atexit
 import json
 from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
+from .clock import utc_now_iso
 from .config import ROOT
+from .json_utils import dumps, dumps_line, loads, write_atomic
 from .logging_utils import get_logger
 
 log = get_logger(__name__)
@@ -20,6 +22,8 @@ log = get_logger(__name__)
 DATA_DIR = ROOT / "data"
 PROFILE_PATH = DATA_DIR / "user_profile.json"
 EXPERIENCE_LOG_PATH = DATA_DIR / "experience_log.jsonl"
+# Snapshot key: size of experience_log.jsonl already folded into the profile.
+LOG_OFFSET_KEY = "experience_log_offset"
 
 
 @dataclass
@@ -51,11 +55,26 @@ class UserProfile:
 
 
 class UserProfileStore:
-    """Handles loading/updating the profile and appending experience logs."""
+    """Handles loading/updating the profile and appending experience logs.
+
+    Each event is applied in memory and appended to experience_log.jsonl;
+    user_profile.json is only rewritten every SNAPSHOT_EVERY events and at
+    exit. The snapshot records how much of the log it covers, so events
+    logged after it are replayed on load.
+    """
+
+    SNAPSHOT_EVERY = 32
+    # Buffered experience-log entries are pushed to the OS every
+    # LOG_FLUSH_EVERY events (and with every snapshot); 1 = per event.
+    LOG_FLUSH_EVERY = 8
 
     def __init__(self) -> None:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self._dirty_count = 0
+        self._unflushed = 0
         self._profile = self._load()
+        self._log = EXPERIENCE_LOG_PATH.open("ab", buffering=1 << 16)
+        atexit.register(self.close)
 
     # --- Persistence ---------------------------------------------------------
 
@@ -66,7 +85,14 @@ class UserProfileStore:
             return profile
         try:
             raw = json.loads(PROFILE_PATH.read_text(encoding="utf-8"))
-            return UserProfile.from_dict(raw)
+            profile = UserProfile.from_dict(raw)
+            offset = raw.get(LOG_OFFSET_KEY)
+            if offset is None:
+                # Written before the log offset existed; stamp it now.
+                self._save(profile)
+            else:
+                self._dirty_count = self._replay(profile, offset)
+            return profile
         except Exception as e:  # pragma: no cover
             log.error("Failed to load user_profile.json: %s", e)
             profile = UserProfile()
@@ -74,7 +100,43 @@ class UserProfileStore:
             return profile
 
     def _save(self, profile: UserProfile) -> None:
-        PROFILE_PATH.write_text(json.dumps(profile.to_dict(), indent=2), encoding="utf-8")
+        data = profile.to_dict()
+        data[LOG_OFFSET_KEY] = EXPERIENCE_LOG_PATH.stat().st_size if EXPERIENCE_LOG_PATH.exists() else 0
+        write_atomic(PROFILE_PATH, dumps(data, indent=True))
+
+    @staticmethod
+    def _replay(profile: UserProfile, offset: int) -> int:
+        """Apply log entries written after `offset`; return how many."""
+        replayed = 0
+        try:
+            with EXPERIENCE_LOG_PATH.open("rb") as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        entry = loads(line)
+                    except ValueError:
+                        continue
+                    _apply(profile, entry)
+                    replayed += 1
+        except FileNotFoundError:
+            pass
+        return replayed
+
+    def flush(self) -> None:
+        """Write the profile snapshot if events were recorded since the last one."""
+        # The snapshot's log offset must cover everything already applied.
+        self._log.flush()
+        self._unflushed = 0
+        if self._dirty_count:
+            self._save(self._profile)
+            self._dirty_count = 0
+
+    def close(self) -> None:
+        """Flush pending state and release the experience-log handle."""
+        if self._log.closed:
+            return
+        self.flush()
+        self._log.close()
 
     def snapshot(self) -> UserProfile:
         return self._profile
@@ -82,35 +144,46 @@ class UserProfileStore:
     # --- Learning hooks ------------------------------------------------------
 
     def record_chat(self, message: str, reply: str) -> None:
-        self._profile.chats_total += 1
-        self._profile.last_seen_iso = datetime.now(timezone.utc).isoformat()
-        self._save(self._profile)
-
-        entry = {
+        self._record({
             "kind": "chat",
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": utc_now_iso(),
             "message": message,
             "reply": reply,
-        }
-        with EXPERIENCE_LOG_PATH.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        })
 
     def record_tool(self, name: str, ok: bool, detail: str) -> None:
-        self._profile.tools_total += 1
-        if ok:
-            self._profile.tools_successful += 1
-        self._profile.last_seen_iso = datetime.now(timezone.utc).isoformat()
-        self._save(self._profile)
-
-        entry = {
+        self._record({
             "kind": "tool",
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": utc_now_iso(),
             "tool": name,
             "ok": ok,
             "detail": detail,
-        }
-        with EXPERIENCE_LOG_PATH.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        })
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        _apply(self._profile, entry)
+        self._log.write(dumps_line(entry))
+        self._dirty_count += 1
+        self._unflushed += 1
+        if self._dirty_count >= self.SNAPSHOT_EVERY:
+            self.flush()
+        elif self._unflushed >= self.LOG_FLUSH_EVERY:
+            self._log.flush()
+            self._unflushed = 0
+
+
+def _apply(profile: UserProfile, entry: Dict[str, Any]) -> None:
+    """Fold one experience-log entry into the profile counters."""
+    kind = entry.get("kind")
+    if kind == "chat":
+        profile.chats_total += 1
+    elif kind == "tool":
+        profile.tools_total += 1
+        if entry.get("ok"):
+            profile.tools_successful += 1
+    else:
+        return
+    profile.last_seen_iso = entry.get("ts", profile.last_seen_iso)
 
 
 # Singleton-style accessor so the rest of the app can use one store.
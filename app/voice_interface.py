@@ -6,6 +6,7 @@ Bathy can run without them. Configuration is driven by GoodBoy_config.json.
 """
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
@@ -65,6 +66,10 @@ class WakeWordListener:
     def __init__(self, voice_cfg: VoiceConfig, energy_threshold: float = 0.02) -> None:
         self.voice_cfg = voice_cfg
         self.energy_threshold = energy_threshold
+        # Audio is captured as int16; the gate compares the summed absolute
+        # sample values of a block against this precomputed integer.
+        self._block_size = 1600
+        self._block_threshold = int(energy_threshold * 32768 * self._block_size)
         self._check_libs()
 
     def _check_libs(self) -> None:
@@ -77,21 +82,39 @@ class WakeWordListener:
     def wait_for_wake(self, seconds: int = 10) -> bool:
         """Block and listen for any loud-enough sound.
 
-        Returns True if sound activity is detected within the window.
+        Audio is checked in 100 ms blocks as it arrives, so this returns as
+        soon as one block is loud enough. Returns True if sound activity is
+        detected within the window.
         """
 
         if not self.voice_cfg.enabled:
             return False
 
         samplerate = 16000
-        duration = seconds
         log.info("WakeWordListener listening", extra={"seconds": seconds})
 
-        recording = sd.rec(int(duration * samplerate), samplerate=samplerate, channels=1)
-        sd.wait()
-        energy = float(np.abs(recording).mean())  # type: ignore[arg-type]
+        detected = threading.Event()
+        peak = 0
+
+        def on_block(indata, frames, time, status) -> None:
+            nonlocal peak
+            total = int(np.abs(indata, dtype=np.int32).sum())
+            peak = max(peak, total)
+            if total > self._block_threshold:
+                detected.set()
+                raise sd.CallbackStop
+
+        with sd.InputStream(
+            samplerate=samplerate,
+            channels=1,
+            blocksize=self._block_size,
+            dtype="int16",
+            callback=on_block,
+        ):
+            detected.wait(seconds)
+        energy = peak / (32768 * self._block_size)
         log.info("WakeWordListener energy", extra={"energy": energy})
-        return energy > self.energy_threshold
+        return detected.is_set()
 
 
 class TextToSpeech:
@@ -123,24 +146,36 @@ class SpeechToText:
 
     Records a short audio snippet from the microphone and runs local Whisper
     transcription. This requires sounddevice, numpy, and the `whisper` package.
+    The model is loaded on the first transcription, not at construction.
     """
 
     def __init__(self, voice_cfg: VoiceConfig) -> None:
         self.voice_cfg = voice_cfg
+        # "base" is a good balance between speed and accuracy.
+        self._model_name = "base"
         self.model = None
-        if (
-            voice_cfg.stt_backend == "whisper_local"
+        self._load_failed = False
+
+    @property
+    def available(self) -> bool:
+        """Whether transcription can work, without loading the model."""
+        return (
+            self.voice_cfg.stt_backend == "whisper_local"
             and whisper is not None
             and sd is not None
             and np is not None
-        ):
+            and not self._load_failed
+        )
+
+    def _ensure_model(self) -> bool:
+        if self.model is None and self.available:
             try:
-                # "base" is a good balance between speed and accuracy.
-                self.model = whisper.load_model("base")
+                self.model = whisper.load_model(self._model_name)
                 log.info("Whisper STT model loaded", extra={"backend": "whisper_local"})
             except Exception as e:  # pragma: no cover
                 log.error("Failed to load Whisper model: %s", e)
-                self.model = None
+                self._load_failed = True
+        return self.model is not None
 
     def transcribe_once(self, seconds: int = 8) -> str:
         """Record from mic for a few seconds and return recognized text.
@@ -148,21 +183,22 @@ class SpeechToText:
         Returns an empty string on failure.
         """
 
-        if not self.model or not self.voice_cfg.enabled:
-            return ""
-        if sd is None or np is None:
+        if not self.voice_cfg.enabled or not self._ensure_model():
             return ""
 
         samplerate = 16000
         log.info("Recording audio for STT", extra={"seconds": seconds})
         try:
-            recording = sd.rec(int(seconds * samplerate), samplerate=samplerate, channels=1)
+            recording = sd.rec(
+                int(seconds * samplerate), samplerate=samplerate, channels=1, dtype="float32"
+            )
             sd.wait()
         except Exception as e:  # pragma: no cover
             log.error("Error recording audio for STT: %s", e)
             return ""
 
-        audio = recording.flatten().astype("float32")  # type: ignore[arg-type]
+        # Mono float32 already: a flat view is what Whisper takes, no copies.
+        audio = recording.reshape(-1)
         try:
             result = self.model.transcribe(audio)
             text = str(result.get("text", "")).strip()
@@ -197,6 +233,6 @@ def build_voice_stack() -> Dict[str, Any]:
 
     tts = TextToSpeech(voice_cfg)
     stt = SpeechToText(voice_cfg)
-    if stt.model is None:
+    if not stt.available:
         stt = None
     return {"voice_cfg": voice_cfg, "wake_listener": wake_listener, "tts": tts, "stt": stt}
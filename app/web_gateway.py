@@ -1,54 +1,142 @@
 """External Gateways - Web browsing and API interactions."""
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-import json
+import hashlib
+import os
+import time
+from collections import ChainMap, OrderedDict
 from pathlib import Path
 from urllib.parse import urlparse, urljoin
 import re
 
+from .json_utils import dumps, loads, write_atomic
+
+try:  # Optional: C (lexbor) HTML parser for extract_text
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional
+    LexborHTMLParser = None
+
+try:  # Optional: linear-time RE2 engine for the regex fallback
+    import re2
+except ImportError:  # pragma: no cover - optional
+    re2 = None
+
+try:  # Optional: HTTP/2 client for APIGateway.call_api (httpx needs h2 for it)
+    import httpx
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - optional
+    httpx = None
+
+try:  # Optional: fast non-cryptographic hash for cache filenames
+    import xxhash
+except ImportError:  # pragma: no cover - optional
+    xxhash = None
+
+_regex = re2 if re2 is not None else re
+
+# Regex fallback for extract_text when selectolax is unavailable.
+# Script and style blocks are stripped in one pass over the document. The
+# patterns stay within RE2 syntax (inline flags, no backreferences) so a
+# hostile page cannot trigger backtracking when re2 is installed.
+_SCRIPT_STYLE_RE = _regex.compile(
+    r'(?s)<script[^>]*>.*?</script>|<style[^>]*>.*?</style>'
+)
+_TAG_RE = _regex.compile(r'<[^>]+>')
+_WS_RE = _regex.compile(r'\s+')
+
+# Resolved config path -> ((st_mtime_ns, st_size), raw bytes), so APIGateway
+# instances over an unchanged file skip the read. Each still parses its own
+# dict: register_api mutates it, and other instances must not see that.
+_integrations_cache: Dict[str, tuple] = {}
+
+def _make_session() -> requests.Session:
+    """Session with a larger keep-alive pool and retries on gateway errors."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": "GoodBoy.AI/1.0 (Personal Assistant)"
+    })
+    return session
+
+
 class WebGateway:
     """Handles web interactions for GoodBoy.AI."""
     
+    # Characters of page content kept per fetch. The body is streamed and at
+    # most 4 bytes per character are read, so large pages are never buffered.
+    MAX_CONTENT_CHARS = 50000
+    # Seconds a fetched page is served from cache before it is revalidated.
+    CACHE_TTL = 3600
+    # Pages kept in memory (least recently used evicted first).
+    MEMORY_CACHE_SIZE = 256
+    
     def __init__(self, cache_dir: Path = None):
         self.cache_dir = cache_dir or Path("data/web_cache")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "GoodBoy.AI/1.0 (Personal Assistant)"
-        })
+        self.session = _make_session()
+        # url -> (expires_at epoch, cached result); disk hits are promoted here.
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
     
     def fetch_url(self, url: str, use_cache: bool = True) -> Dict:
-        """Fetch content from a URL."""
-        cache_key = self._url_to_cache_key(url)
-        cache_file = self.cache_dir / f"{cache_key}.json"
+        """Fetch content from a URL.
         
-        # Check cache
-        if use_cache and cache_file.exists():
-            try:
-                cached = json.loads(cache_file.read_text())
-                cache_time = datetime.fromisoformat(cached["fetched_at"])
-                # Cache valid for 1 hour
-                if (datetime.now() - cache_time).seconds < 3600:
-                    return cached
-            except Exception:
-                pass
+        Fresh pages come from memory, then from the disk cache. A stale page
+        is revalidated with its ETag / Last-Modified, and a 304 reuses it.
+        """
+        cache_file = self.cache_dir / f"{self._url_to_cache_key(url)}.json"
+        
+        stale = None
+        if use_cache:
+            cached = self._cache_lookup(url, cache_file)
+            if cached is not None:
+                expires_at, entry = cached
+                if time.time() < expires_at:
+                    return entry
+                stale = entry
+        
+        headers = {}
+        if stale is not None:
+            if stale.get("etag"):
+                headers["If-None-Match"] = stale["etag"]
+            if stale.get("last_modified"):
+                headers["If-Modified-Since"] = stale["last_modified"]
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            result = {
-                "url": url,
-                "status_code": response.status_code,
-                "content_type": response.headers.get("content-type", ""),
-                "content": response.text[:50000],  # Limit content size
-                "fetched_at": datetime.now().isoformat(),
-                "success": True
-            }
+            with self.session.get(url, timeout=30, stream=True, headers=headers) as response:
+                if response.status_code == 304 and stale is not None:
+                    result = dict(stale, fetched_at=datetime.now().isoformat())
+                else:
+                    response.raise_for_status()
+                    raw = response.raw.read(self.MAX_CONTENT_CHARS * 4, decode_content=True)
+                    content = raw.decode(response.encoding or "utf-8", errors="replace")
+                    
+                    result = {
+                        "url": url,
+                        "status_code": response.status_code,
+                        "content_type": response.headers.get("content-type", ""),
+                        "content": content[:self.MAX_CONTENT_CHARS],  # Limit content size
+                        "fetched_at": datetime.now().isoformat(),
+                        "success": True
+                    }
+                    etag = response.headers.get("etag")
+                    if etag:
+                        result["etag"] = etag
+                    last_modified = response.headers.get("last-modified")
+                    if last_modified:
+                        result["last_modified"] = last_modified
             
             # Cache result
-            cache_file.write_text(json.dumps(result))
+            write_atomic(cache_file, dumps(result))
+            self._remember(url, time.time() + self.CACHE_TTL, result)
             
             return result
             
@@ -60,18 +148,48 @@ class WebGateway:
                 "fetched_at": datetime.now().isoformat()
             }
     
+    def _cache_lookup(self, url: str, cache_file: Path) -> Optional[tuple]:
+        """(expires_at, entry) for url from memory or disk, or None."""
+        cached = self._memory.get(url)
+        if cached is not None:
+            self._memory.move_to_end(url)
+            return cached
+        try:
+            entry = loads(cache_file.read_bytes())
+            fetched_at = datetime.fromisoformat(entry["fetched_at"]).timestamp()
+        except Exception:
+            return None
+        expires_at = fetched_at + self.CACHE_TTL
+        self._remember(url, expires_at, entry)
+        return expires_at, entry
+    
+    def _remember(self, url: str, expires_at: float, entry: Dict):
+        """Keep a cached page in memory, evicting the least recently used."""
+        self._memory[url] = (expires_at, entry)
+        self._memory.move_to_end(url)
+        if len(self._memory) > self.MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+    
     def _url_to_cache_key(self, url: str) -> str:
-        """Convert URL to a safe cache filename."""
-        import hashlib
-        return hashlib.md5(url.encode()).hexdigest()[:16]
+        """Convert URL to a safe cache filename (16 hex characters)."""
+        if xxhash is not None:
+            return xxhash.xxh64_hexdigest(url.encode())
+        return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
     
     def extract_text(self, html: str) -> str:
         """Extract readable text from HTML."""
-        # Simple text extraction (no BeautifulSoup dependency)
-        text = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
-        text = re.sub(r'<[^>]+>', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
+        if LexborHTMLParser is not None:
+            try:
+                tree = LexborHTMLParser(html)
+                for node in tree.css("script, style"):
+                    node.decompose()
+                return _WS_RE.sub(' ', tree.text(separator=' ', strip=True)).strip()
+            except Exception:
+                pass
+        # Simple text extraction (no parser dependency)
+        text = _SCRIPT_STYLE_RE.sub('', html)
+        text = _TAG_RE.sub(' ', text)
+        text = _WS_RE.sub(' ', text)
         return text.strip()
     
     def search_web(self, query: str) -> Dict:
@@ -108,21 +226,62 @@ class APIGateway:
     
     def __init__(self, config_path: Path = None):
         self.config_path = config_path or Path("data/api_integrations.json")
+        # Bytes last read from or written to config_path.
+        self._last_serialized: Optional[bytes] = None
         self.integrations = self._load_integrations()
+        # Reused across call_api() so connections to an API stay open.
+        self.session = _make_session()
+        self._client = None
+    
+    def _http_client(self):
+        """HTTP/2 httpx client when available (built on first use), else the session."""
+        if httpx is None:
+            return self.session
+        if self._client is None:
+            self._client = httpx.Client(
+                http2=True,
+                timeout=30.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            )
+        return self._client
     
     def _load_integrations(self) -> Dict:
-        """Load API integrations config."""
-        if self.config_path.exists():
-            try:
-                return json.loads(self.config_path.read_text())
-            except Exception:
-                pass
-        return {"apis": {}}
+        """Load API integrations config, re-reading the file only when it changes.
+        
+        Gateways over the same unchanged file share the raw bytes, never the
+        parsed dict.
+        """
+        key = os.path.abspath(self.config_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return {"apis": {}}
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _integrations_cache.get(key)
+        try:
+            if cached is not None and cached[0] == stamp:
+                raw = cached[1]
+            else:
+                raw = self.config_path.read_bytes()
+            integrations = loads(raw)
+        except Exception:
+            return {"apis": {}}
+        _integrations_cache[key] = (stamp, raw)
+        self._last_serialized = raw
+        return integrations
     
     def _save_integrations(self):
-        """Save API integrations config."""
+        """Save API integrations config atomically; skip if nothing changed."""
+        data = dumps(self.integrations, indent=True)
+        if data == self._last_serialized:
+            return
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        self.config_path.write_text(json.dumps(self.integrations, indent=2))
+        write_atomic(self.config_path, data)
+        self._last_serialized = data
+        key = os.path.abspath(self.config_path)
+        st = os.stat(key)
+        _integrations_cache[key] = ((st.st_mtime_ns, st.st_size), data)
     
     def register_api(self, name: str, base_url: str, api_key: Optional[str] = None, headers: Optional[Dict] = None):
         """Register a new API integration."""
@@ -142,22 +301,24 @@ class APIGateway:
         api = self.integrations["apis"][api_name]
         url = urljoin(api["base_url"], endpoint)
         
-        headers = api.get("headers", {}).copy()
+        # Layer the auth header over the stored headers without copying them.
+        headers = api.get("headers") or {}
         if api.get("api_key"):
-            headers["Authorization"] = f"Bearer {api['api_key']}"
+            headers = ChainMap({"Authorization": f"Bearer {api['api_key']}"}, headers)
         
         try:
+            client = self._http_client()
             if method.upper() == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
+                response = client.get(url, headers=headers, timeout=30)
             elif method.upper() == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=30)
+                response = client.post(url, headers=headers, json=data, timeout=30)
             else:
                 return {"success": False, "error": f"Unsupported method: {method}"}
             
             return {
                 "success": True,
                 "status_code": response.status_code,
-                "data": response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text
+                "data": loads(response.content) if response.headers.get("content-type", "").startswith("application/json") else response.text
             }
             
         except Exception as e:
@@ -2,8 +2,10 @@
 import sys
 import subprocess
 import os
+import shutil
 from pathlib import Path
-import json
+
+from app.json_utils import dumps
 
 def check_python():
     """Check Python version."""
@@ -28,14 +30,28 @@ def install_dependencies():
         print("ERROR: requirements.txt not found")
         sys.exit(1)
     
+    # uv resolves and installs much faster than pip and skips .pyc generation
+    # by default. With pip, prefer wheels and skip .pyc generation as well
+    # (modules are compiled on first import).
+    if shutil.which("uv"):
+        command = ["uv", "pip", "install", "--python", sys.executable]
+    else:
+        command = [sys.executable, "-m", "pip", "install", "--prefer-binary", "--no-compile"]
+    
     try:
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", "-r", "requirements.txt"
-        ])
+        subprocess.check_call(command + ["-r", "requirements.txt"])
         print("✓ Dependencies installed")
     except subprocess.CalledProcessError as e:
         print(f"ERROR: Failed to install dependencies: {e}")
         sys.exit(1)
+    
+    # Accelerators all have fallbacks, so a failure here is only a warning.
+    if Path("requirements-optional.txt").exists():
+        try:
+            subprocess.check_call(command + ["-r", "requirements-optional.txt"])
+            print("✓ Optional accelerators installed")
+        except subprocess.CalledProcessError:
+            print("! Optional accelerators not installed (fallbacks will be used)")
 
 def create_config():
     """Create default config if missing."""
@@ -52,7 +68,7 @@ def create_config():
             "theme": "dark",
             "auto_start_server": True
         }
-        config_path.write_text(json.dumps(config, indent=2))
+        config_path.write_bytes(dumps(config, indent=True))
         print("✓ Config created")
     else:
         print("✓ Config exists")
@@ -69,7 +85,7 @@ def create_behavior():
             "response_style": "concise and actionable",
             "voice_tone": "professional yet warm"
         }
-        behavior_path.write_text(json.dumps(behavior, indent=2))
+        behavior_path.write_bytes(dumps(behavior, indent=True))
         print("✓ Behavior instructions created")
     else:
         print("✓ Behavior instructions exist")
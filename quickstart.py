@@ -1,4 +1,5 @@
 """Quick diagnostic and launch script for GoodBoy.AI."""
+import os
 import sys
 import subprocess
 from pathlib import Path
@@ -43,7 +44,11 @@ def check_installation():
     
     # Check models
     print("\nChecking models...")
-    models = list(Path("models").glob("*.gguf")) if Path("models").exists() else []
+    try:
+        with os.scandir("models") as it:
+            models = [e for e in it if e.name.endswith(".gguf") and e.is_file()]
+    except FileNotFoundError:
+        models = []
     if models:
         print(f"  ✓ Found {len(models)} model(s)")
         for m in models:
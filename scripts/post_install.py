@@ -1,8 +1,12 @@
 """Post-installation setup script."""
 import os
-import json
+import sys
 from pathlib import Path
 
+# Run as scripts/post_install.py: make the app package importable.
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.json_utils import dumps
+
 def setup_directories():
     """Create necessary directories."""
     dirs = [
@@ -16,9 +20,7 @@ def setup_directories():
     
     for d in dirs:
         d.mkdir(exist_ok=True, parents=True)
-        gitkeep = d / ".gitkeep"
-        if not gitkeep.exists():
-            gitkeep.touch()
+        (d / ".gitkeep").touch(exist_ok=True)
     
     print("✓ Created directory structure")
 
@@ -37,8 +39,7 @@ def create_default_config():
             "auto_start_server": True,
             "api_port": 8000,
         }
-        with open(config_path, "w") as f:
-            json.dump(config, f, indent=2)
+        config_path.write_bytes(dumps(config, indent=True))
         print("✓ Created default configuration")
 
 def create_default_behavior():
@@ -66,16 +67,14 @@ def create_default_behavior():
                 "Be concise but thorough"
             ]
         }
-        with open(behavior_path, "w") as f:
-            json.dump(behavior, f, indent=2)
+        behavior_path.write_bytes(dumps(behavior, indent=True))
         print("✓ Created default behavior instructions")
 
 def create_empty_chats():
     """Create empty chats file."""
     chats_path = Path("data/chats_content.json")
     if not chats_path.exists():
-        with open(chats_path, "w") as f:
-            json.dump([], f)
+        chats_path.write_bytes(dumps([]))
         print("✓ Created empty chats file")
 
 def main():
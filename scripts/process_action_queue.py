@@ -1,44 +1,60 @@
 """Process queued actions from the Evolution system."""
-import json
+import sys
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 
-def main():
-    """Process pending actions from the action queue."""
+# Run as scripts/process_action_queue.py: make the app package importable.
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.json_utils import dumps_line, loads
+
+def main(out=None):
+    """Process pending actions from the action queue.
+    
+    Progress goes to ``out`` (a text stream), or stdout when it is None.
+    """
     memory_dir = Path("memory")
     overseer_file = memory_dir / "overseer_suggestions.jsonl"
     processed_file = memory_dir / "processed_actions.jsonl"
     
     if not overseer_file.exists():
-        print("[v0] No pending actions to process")
+        print("[v0] No pending actions to process", file=out)
         return
     
-    with open(overseer_file, 'r') as f:
-        pending = [json.loads(line) for line in f if line.strip()]
+    # Stream the file and keep only the last 10 raw lines; only those are parsed.
+    tail = deque(maxlen=10)
+    total = 0
+    with open(overseer_file, 'rb') as f:
+        for line in f:
+            if line.strip():
+                tail.append(line)
+                total += 1
+    pending = [loads(line) for line in tail]
     
-    print(f"[v0] Processing {len(pending)} pending actions...")
+    print(f"[v0] Processing {total} pending actions...", file=out)
     
-    # Process each action (implement your logic here)
-    for action in pending[-10:]:  # Last 10
-        action_id = action.get("id", "unknown")
-        description = action.get("description", "")
-        
-        print(f"[v0] Processing: {action_id}")
-        print(f"     Description: {description}")
-        
-        # Log as processed
-        processed = {
-            "timestamp": datetime.now().isoformat(),
-            "action_id": action_id,
-            "status": "completed"
-        }
-        
-        with open(processed_file, 'a') as f:
-            f.write(json.dumps(processed) + '\n')
-        
-        print(f"[v0]     ✓ Completed")
+    # One buffered append handle for the whole batch.
+    with open(processed_file, 'ab', buffering=1 << 16) as pf:
+        # Process each action (implement your logic here)
+        for action in pending:  # Last 10
+            action_id = action.get("id", "unknown")
+            description = action.get("description", "")
+            
+            print(f"[v0] Processing: {action_id}", file=out)
+            print(f"     Description: {description}", file=out)
+            
+            # Log as processed
+            processed = {
+                "timestamp": datetime.now().isoformat(),
+                "action_id": action_id,
+                "status": "completed"
+            }
+            
+            pf.write(dumps_line(processed))
+            
+            print(f"[v0]     ✓ Completed", file=out)
     
-    print(f"[v0] Action queue processing complete")
+    print(f"[v0] Action queue processing complete", file=out)
 
 if __name__ == "__main__":
     main()
@@ -1,69 +1,86 @@
 """Test script to verify built executables work correctly."""
+import io
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import httpx
 
-def test_server():
+def test_server(out=None):
     """Test backend server executable."""
-    print("Testing backend server...")
+    print("Testing backend server...", file=out)
     
     server_exe = Path("dist/GoodBoyServer/GoodBoyServer.exe")
     if not server_exe.exists():
-        print(f"❌ Server executable not found: {server_exe}")
+        print(f"❌ Server executable not found: {server_exe}", file=out)
         return False
     
     # Start server
-    print("Starting server...")
+    print("Starting server...", file=out)
     proc = subprocess.Popen([str(server_exe)])
-    
-    # Wait for server to start
-    time.sleep(5)
-    
-    # Test health endpoint
     try:
-        response = httpx.get("http://127.0.0.1:8000/health", timeout=5)
-        if response.status_code == 200:
-            print("✓ Server is responding correctly")
-            result = True
-        else:
-            print(f"❌ Server returned status {response.status_code}")
-            result = False
-    except Exception as e:
-        print(f"❌ Failed to connect to server: {e}")
-        result = False
-    
-    # Stop server
-    proc.terminate()
-    proc.wait()
+        # Poll the health endpoint with backoff instead of a fixed sleep; the same
+        # client (and connection) is reused for the final check.
+        with httpx.Client(base_url="http://127.0.0.1:8000", timeout=0.5) as client:
+            deadline = time.monotonic() + 10
+            delay = 0.05
+            while time.monotonic() < deadline:
+                try:
+                    if client.get("/health").status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                time.sleep(delay)
+                delay = min(delay * 1.5, 0.5)
+            
+            # Test health endpoint
+            try:
+                response = client.get("/health", timeout=5)
+                if response.status_code == 200:
+                    print("✓ Server is responding correctly", file=out)
+                    result = True
+                else:
+                    print(f"❌ Server returned status {response.status_code}", file=out)
+                    result = False
+            except Exception as e:
+                print(f"❌ Failed to connect to server: {e}", file=out)
+                result = False
+    finally:
+        # Stop server; kill it if shutdown stalls
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait(timeout=2)
     
     return result
 
-def test_ui():
+def test_ui(out=None):
     """Test desktop UI executable."""
-    print("\nTesting desktop UI...")
+    print("\nTesting desktop UI...", file=out)
     
     ui_exe = Path("dist/GoodBoy/GoodBoy.exe")
     if not ui_exe.exists():
-        print(f"❌ UI executable not found: {ui_exe}")
+        print(f"❌ UI executable not found: {ui_exe}", file=out)
         return False
     
-    print(f"✓ UI executable exists: {ui_exe}")
-    print("  (Manual testing required - launch the UI to verify)")
+    print(f"✓ UI executable exists: {ui_exe}", file=out)
+    print("  (Manual testing required - launch the UI to verify)", file=out)
     return True
 
-def test_installer():
+def test_installer(out=None):
     """Check installer was created."""
-    print("\nChecking installer...")
+    print("\nChecking installer...", file=out)
     
     installer = Path("dist/installer/GoodBoy_AI_Setup.exe")
     if not installer.exists():
-        print(f"❌ Installer not found: {installer}")
+        print(f"❌ Installer not found: {installer}", file=out)
         return False
     
     size_mb = installer.stat().st_size / (1024 * 1024)
-    print(f"✓ Installer exists: {installer} ({size_mb:.1f} MB)")
+    print(f"✓ Installer exists: {installer} ({size_mb:.1f} MB)", file=out)
     return True
 
 def main():
@@ -73,11 +90,23 @@ def main():
     print("=" * 60)
     print()
     
-    results = {
-        "Server": test_server(),
-        "UI": test_ui(),
-        "Installer": test_installer(),
+    # The checks are independent: the file checks finish while the server warms up.
+    # Each writes to its own buffer, printed whole and in order, so their
+    # output never interleaves.
+    checks = {
+        "Server": test_server,
+        "UI": test_ui,
+        "Installer": test_installer,
     }
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        runs = {}
+        for name, check in checks.items():
+            buf = io.StringIO()
+            runs[name] = (pool.submit(check, out=buf), buf)
+        results = {}
+        for name, (future, buf) in runs.items():
+            results[name] = future.result()
+            print(buf.getvalue(), end="")
     
     print("\n" + "=" * 60)
     print("Test Results:")
@@ -1,7 +1,12 @@
 """Verify GoodBoy.AI installation is complete and working."""
+import os
 import sys
 from pathlib import Path
-import json
+
+# Run as scripts/verify_installation.py: make the app package importable.
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.diagnostics import CORE_DEPENDENCIES, OPTIONAL_DEPENDENCIES, missing_modules
+from app.json_utils import loads
 
 def check_mark(condition, msg):
     """Print check or X based on condition."""
@@ -10,136 +15,98 @@ def check_mark(condition, msg):
     print(f"  [{symbol}] {msg}: {status}")
     return condition
 
-def verify_structure():
-    """Verify directory structure."""
-    print("\n📁 Directory Structure")
-    print("=" * 50)
-    
-    required_dirs = [
-        Path("app"),
-        Path("data"),
-        Path("memory"),
-        Path("models"),
-        Path("logs"),
-        Path("tests"),
-        Path("installer"),
-        Path("scripts"),
-    ]
-    
-    all_good = True
-    for d in required_dirs:
-        exists = d.exists() and d.is_dir()
-        check_mark(exists, str(d))
-        all_good = all_good and exists
-    
-    return all_good
+# Path checks as one table: (summary category, path, kind), in display order.
+PATH_CHECKS = [
+    ("Structure", "app", "dir"),
+    ("Structure", "data", "dir"),
+    ("Structure", "memory", "dir"),
+    ("Structure", "models", "dir"),
+    ("Structure", "logs", "dir"),
+    ("Structure", "tests", "dir"),
+    ("Structure", "installer", "dir"),
+    ("Structure", "scripts", "dir"),
+    ("Python Files", "app/main.py", "file"),
+    ("Python Files", "app/council.py", "file"),
+    ("Python Files", "app/llm.py", "file"),
+    ("Python Files", "app/memory.py", "file"),
+    ("Python Files", "app/agents/base.py", "file"),
+    ("Python Files", "app/agents/batman.py", "file"),
+    ("Python Files", "app/agents/alfred.py", "file"),
+    ("Python Files", "app/agents/jarvis.py", "file"),
+    ("Python Files", "app/agents/davinci.py", "file"),
+    ("Python Files", "app/agents/architect.py", "file"),
+    ("Python Files", "app/agents/analyst.py", "file"),
+    ("Python Files", "GoodBoy_ui.py", "file"),
+    ("Build System", "GoodBoy_ui.spec", "file"),
+    ("Build System", "GoodBoy_server.spec", "file"),
+    ("Build System", "installer/GoodBoy_installer.iss", "file"),
+    ("Build System", "build_full_installer.bat", "file"),
+    ("Build System", "requirements.txt", "file"),
+    ("Build System", "setup.ps1", "file"),
+    ("Launchers", "GoodBoy_launcher.bat", "file"),
+    ("Launchers", "run_server.bat", "file"),
+    ("Launchers", "run_dashboard.bat", "file"),
+    ("Launchers", "run_desktop_ui.bat", "file"),
+    ("Launchers", "build_desktop_exe.bat", "file"),
+    ("Documentation", "README.md", "file"),
+    ("Documentation", "BUILD_GUIDE.md", "file"),
+    ("Documentation", "LICENSE.txt", "file"),
+    ("Documentation", "installer/README_BEFORE.txt", "file"),
+    ("Documentation", "installer/README_AFTER.txt", "file"),
+]
 
-def verify_python_files():
-    """Verify critical Python files exist."""
-    print("\n🐍 Core Python Files")
-    print("=" * 50)
-    
-    required_files = [
-        Path("app/main.py"),
-        Path("app/council.py"),
-        Path("app/llm.py"),
-        Path("app/memory.py"),
-        Path("app/agents/base.py"),
-        Path("app/agents/batman.py"),
-        Path("app/agents/alfred.py"),
-        Path("app/agents/jarvis.py"),
-        Path("app/agents/davinci.py"),
-        Path("app/agents/architect.py"),
-        Path("app/agents/analyst.py"),
-        Path("GoodBoy_ui.py"),
-    ]
-    
-    all_good = True
-    for f in required_files:
-        exists = f.exists() and f.is_file()
-        check_mark(exists, str(f))
-        all_good = all_good and exists
-    
-    return all_good
+PATH_SECTIONS = {
+    "Structure": "📁 Directory Structure",
+    "Python Files": "🐍 Core Python Files",
+    "Build System": "🔨 Build System Files",
+    "Launchers": "🚀 Launcher Scripts",
+    "Documentation": "📚 Documentation",
+}
 
-def verify_build_files():
-    """Verify build and installer files."""
-    print("\n🔨 Build System Files")
-    print("=" * 50)
-    
-    build_files = [
-        Path("GoodBoy_ui.spec"),
-        Path("GoodBoy_server.spec"),
-        Path("installer/GoodBoy_installer.iss"),
-        Path("build_full_installer.bat"),
-        Path("requirements.txt"),
-        Path("setup.ps1"),
-    ]
-    
-    all_good = True
-    for f in build_files:
-        exists = f.exists() and f.is_file()
-        check_mark(exists, str(f))
-        all_good = all_good and exists
-    
-    return all_good
-
-def verify_launcher_scripts():
-    """Verify launcher scripts exist."""
-    print("\n🚀 Launcher Scripts")
-    print("=" * 50)
-    
-    scripts = [
-        Path("GoodBoy_launcher.bat"),
-        Path("run_server.bat"),
-        Path("run_dashboard.bat"),
-        Path("run_desktop_ui.bat"),
-        Path("build_desktop_exe.bat"),
-    ]
-    
-    all_good = True
-    for s in scripts:
-        exists = s.exists() and s.is_file()
-        check_mark(exists, str(s))
-        all_good = all_good and exists
-    
-    return all_good
+def verify_paths():
+    """Run every path check in one pass; return pass/fail per category."""
+    results = {}
+    for category, path, kind in PATH_CHECKS:
+        if category not in results:
+            print(f"\n{PATH_SECTIONS[category]}")
+            print("=" * 50)
+            results[category] = True
+        exists = os.path.isdir(path) if kind == "dir" else os.path.isfile(path)
+        check_mark(exists, str(Path(path)))
+        results[category] = results[category] and exists
+    return results
 
 def verify_config_files():
     """Verify configuration files."""
     print("\n⚙️ Configuration Files")
     print("=" * 50)
     
-    # Check if config exists
+    # Check if config exists (reading it answers that; no separate stat)
     config_path = Path("data/GoodBoy_config.json")
-    if config_path.exists():
-        try:
-            with open(config_path) as f:
-                config = json.load(f)
-            check_mark(True, "GoodBoy_config.json (valid JSON)")
-            check_mark("engine" in config, "  - Has 'engine' setting")
-            check_mark("model_path" in config, "  - Has 'model_path' setting")
-        except Exception:
-            check_mark(False, "GoodBoy_config.json (INVALID JSON)")
-            return False
-    else:
+    try:
+        config = loads(config_path.read_bytes())
+        check_mark(True, "GoodBoy_config.json (valid JSON)")
+        check_mark("engine" in config, "  - Has 'engine' setting")
+        check_mark("model_path" in config, "  - Has 'model_path' setting")
+    except FileNotFoundError:
         check_mark(False, "GoodBoy_config.json")
         print("    Run scripts/post_install.py to create default config")
         return False
+    except Exception:
+        check_mark(False, "GoodBoy_config.json (INVALID JSON)")
+        return False
     
     # Check behavior instructions
     behavior_path = Path("data/Behavior_instructions.json")
-    if behavior_path.exists():
-        try:
-            with open(behavior_path) as f:
-                behavior = json.load(f)
-            check_mark(True, "Behavior_instructions.json")
-        except Exception:
-            check_mark(False, "Behavior_instructions.json (INVALID JSON)")
-            return False
-    else:
+    try:
+        loads(behavior_path.read_bytes())
+        check_mark(True, "Behavior_instructions.json")
+    except FileNotFoundError:
         check_mark(False, "Behavior_instructions.json")
         print("    Run scripts/post_install.py to create default behavior")
+    except Exception:
+        check_mark(False, "Behavior_instructions.json (INVALID JSON)")
+        return False
     
     return True
 
@@ -148,105 +115,69 @@ def verify_dependencies():
     print("\n📦 Python Dependencies")
     print("=" * 50)
     
-    deps = [
-        ("fastapi", "FastAPI"),
-        ("uvicorn", "Uvicorn"),
-        ("pydantic", "Pydantic"),
-        ("httpx", "HTTPX"),
-        ("gradio", "Gradio"),
-    ]
+    missing = set(missing_modules(name for name, _ in CORE_DEPENDENCIES + OPTIONAL_DEPENDENCIES))
     
     all_good = True
-    for module_name, display_name in deps:
-        try:
-            __import__(module_name)
-            check_mark(True, display_name)
-        except ImportError:
-            check_mark(False, display_name)
-            all_good = False
-    
-    # Optional dependencies
-    optional_deps = [
-        ("gpt4all", "GPT4All (for local models)"),
-        ("chromadb", "ChromaDB (for vector search)"),
-        ("pypdf", "PyPDF (for PDF parsing)"),
-    ]
+    for module_name, display_name in CORE_DEPENDENCIES:
+        installed = module_name not in missing
+        check_mark(installed, display_name)
+        all_good = all_good and installed
     
     print("\n  Optional dependencies:")
-    for module_name, display_name in optional_deps:
-        try:
-            __import__(module_name)
+    for module_name, display_name in OPTIONAL_DEPENDENCIES:
+        if module_name not in missing:
             check_mark(True, display_name)
-        except ImportError:
+        else:
             check_mark(False, display_name)
             print(f"    Note: {display_name} is optional but recommended")
     
     return all_good
 
-def verify_documentation():
-    """Check documentation files."""
-    print("\n📚 Documentation")
-    print("=" * 50)
-    
-    docs = [
-        Path("README.md"),
-        Path("BUILD_GUIDE.md"),
-        Path("LICENSE.txt"),
-        Path("installer/README_BEFORE.txt"),
-        Path("installer/README_AFTER.txt"),
-    ]
-    
-    all_good = True
-    for d in docs:
-        exists = d.exists() and d.is_file()
-        check_mark(exists, str(d))
-        all_good = all_good and exists
-    
-    return all_good
-
 def main():
     """Run all verifications."""
-    print("\n" + "=" * 50)
-    print("  GoodBoy.AI Installation Verification")
-    print("=" * 50)
+    rule = "=" * 50
+    print(f"\n{rule}\n  GoodBoy.AI Installation Verification\n{rule}")
     
+    path_results = verify_paths()
     results = {
-        "Structure": verify_structure(),
-        "Python Files": verify_python_files(),
-        "Build System": verify_build_files(),
-        "Launchers": verify_launcher_scripts(),
+        "Structure": path_results["Structure"],
+        "Python Files": path_results["Python Files"],
+        "Build System": path_results["Build System"],
+        "Launchers": path_results["Launchers"],
         "Configuration": verify_config_files(),
         "Dependencies": verify_dependencies(),
-        "Documentation": verify_documentation(),
+        "Documentation": path_results["Documentation"],
     }
     
-    print("\n" + "=" * 50)
-    print("  Verification Summary")
-    print("=" * 50)
-    
+    # The summary is assembled and written in one call.
+    lines = [f"\n{rule}", "  Verification Summary", rule]
     all_passed = True
     for category, passed in results.items():
         symbol = "✓" if passed else "✗"
-        print(f"  [{symbol}] {category}")
+        lines.append(f"  [{symbol}] {category}")
         all_passed = all_passed and passed
     
-    print("\n" + "=" * 50)
+    lines.append(f"\n{rule}")
     if all_passed:
-        print("  ✓ All checks passed!")
-        print("  GoodBoy.AI is ready to build and deploy.")
-        print("\n  Next steps:")
-        print("  1. Run: .\\build_full_installer.bat")
-        print("  2. Test: .\\scripts\\test_build.py")
-        print("  3. Deploy: dist\\installer\\GoodBoy_AI_Setup.exe")
+        lines += [
+            "  ✓ All checks passed!",
+            "  GoodBoy.AI is ready to build and deploy.",
+            "\n  Next steps:",
+            "  1. Run: .\\build_full_installer.bat",
+            "  2. Test: .\\scripts\\test_build.py",
+            "  3. Deploy: dist\\installer\\GoodBoy_AI_Setup.exe",
+        ]
     else:
-        print("  ✗ Some checks failed.")
-        print("  Please review the issues above.")
-        print("\n  Common fixes:")
-        print("  - Missing dependencies: pip install -r requirements.txt")
-        print("  - Missing config: python scripts\\post_install.py")
-        print("  - Missing files: Check git status and pull latest")
-    
-    print("=" * 50)
+        lines += [
+            "  ✗ Some checks failed.",
+            "  Please review the issues above.",
+            "\n  Common fixes:",
+            "  - Missing dependencies: pip install -r requirements.txt",
+            "  - Missing config: python scripts\\post_install.py",
+            "  - Missing files: Check git status and pull latest",
+        ]
+    lines.append(rule)
+    print("\n".join(lines))
     
     return 0 if all_passed else 1
 
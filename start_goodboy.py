@@ -6,19 +6,42 @@ import sys
 import subprocess
 import os
 from pathlib import Path
-import json
 import time
+import urllib.error
+import urllib.request
+
+from app.json_utils import dumps, loads
+
+_RULE = "=" * 70
+
+# Built once and written in a single call rather than one print per line.
+_BANNER = "\n".join([
+    "\n" + _RULE,
+    "  ____                 _ ____              _    ___",
+    " / ___| ___   ___   __| | __ )  ___  _   _/ \\  |_ _|",
+    "| |  _ / _ \\ / _ \\ / _` |  _ \\ / _ \\| | | / _ \\  | |",
+    "| |_| | (_) | (_) | (_| | |_) | (_) | |_| / ___ \\ | |",
+    " \\____|\\___/ \\___/ \\__,_|____/ \\___/ \\__, /_/   \\_\\___|",
+    "                                     |___/",
+    "\nSelf-Aware, Self-Learning Personal Assistant",
+    _RULE + "\n",
+]) + "\n"
+
+_RUNNING_NOTICE = "\n".join([
+    "\n" + _RULE,
+    "GoodBoy.AI is running!",
+    _RULE,
+    "\n💡 Tips:",
+    "   - Download a model using Tools → Model Manager",
+    "   - Adjust settings in Tools → Settings",
+    "   - GoodBoy learns from every conversation",
+    "\n   Close this window to shut down GoodBoy.AI",
+    _RULE,
+]) + "\n"
 
 def print_banner():
-    print("\n" + "=" * 70)
-    print("  ____                 _ ____              _    ___")
-    print(" / ___| ___   ___   __| | __ )  ___  _   _/ \\  |_ _|")
-    print("| |  _ / _ \\ / _ \\ / _` |  _ \\ / _ \\| | | / _ \\  | |")
-    print("| |_| | (_) | (_) | (_| | |_) | (_) | |_| / ___ \\ | |")
-    print(" \\____|\\___/ \\___/ \\__,_|____/ \\___/ \\__, /_/   \\_\\___|")
-    print("                                     |___/")
-    print("\nSelf-Aware, Self-Learning Personal Assistant")
-    print("=" * 70 + "\n")
+    sys.stdout.write(_BANNER)
+    sys.stdout.flush()
 
 def check_python():
     """Check Python version."""
@@ -50,27 +73,40 @@ def check_directories():
     return True
 
 def check_dependencies():
-    """Check if dependencies are installed."""
-    try:
-        import fastapi
-        import uvicorn
-        import gpt4all
+    """Check if dependencies are installed (skipped while a pass is remembered)."""
+    from app.diagnostics import (
+        REQUIRED_MODULES,
+        dependencies_known_ok,
+        environment_signature,
+        missing_modules,
+        remember_dependencies_ok,
+    )
+    
+    signature = environment_signature()
+    if dependencies_known_ok(signature):
         print("[OK] Core dependencies installed")
         return True
-    except ImportError as e:
-        print(f"[!] Warning: Some dependencies missing")
-        print(f"   {e}")
-        response = input("\nInstall now? (y/n): ").strip().lower()
-        if response == 'y':
-            return install_dependencies()
-        return False
+    missing = missing_modules(REQUIRED_MODULES)
+    if not missing:
+        print("[OK] Core dependencies installed")
+        remember_dependencies_ok(signature)
+        return True
+    
+    print(f"[!] Warning: Some dependencies missing")
+    print(f"   No module named {', '.join(missing)}")
+    response = input("\nInstall now? (y/n): ").strip().lower()
+    if response == 'y':
+        return install_dependencies()
+    return False
 
 def install_dependencies():
     """Install required packages."""
     print("\nInstalling dependencies...")
     try:
+        # Skip pip's self-version check and prefer wheels over source builds.
         subprocess.check_call([
-            sys.executable, "-m", "pip", "install", "-r", "requirements.txt", "--quiet"
+            sys.executable, "-m", "pip", "install", "-r", "requirements.txt", "--quiet",
+            "--disable-pip-version-check", "--no-input", "--prefer-binary"
         ])
         print("✓ Dependencies installed successfully")
         return True
@@ -95,7 +131,7 @@ def check_config():
             "auto_start_server": True,
             "show_chain_of_thought": True
         }
-        config_path.write_text(json.dumps(config, indent=2))
+        config_path.write_bytes(dumps(config, indent=True))
         print("[OK] Configuration created")
     else:
         print("[OK] Configuration found")
@@ -103,7 +139,11 @@ def check_config():
 
 def check_models():
     """Check if models are available."""
-    models = list(Path("models").glob("*.gguf")) if Path("models").exists() else []
+    try:
+        with os.scandir("models") as it:
+            models = [e for e in it if e.name.endswith(".gguf") and e.is_file()]
+    except FileNotFoundError:
+        models = []
     if models:
         print(f"[OK] Found {len(models)} model(s):")
         for m in models[:3]:
@@ -126,18 +166,44 @@ def check_brain():
         print(f"[!] Brain module warning: {e}")
         return True  # Not critical
 
+def wait_for_server(process, url="http://127.0.0.1:8000/", timeout=10.0):
+    """Poll the server with backoff until it answers or the process exits."""
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=0.5):
+                return True
+        except urllib.error.HTTPError:
+            return True  # Responding, even if not with 200
+        except OSError:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.5)
+    # Still booting (e.g. loading a model) counts as started, as before.
+    return process.poll() is None
+
 def start_server():
     """Start the FastAPI backend server."""
     print("\n[...] Starting GoodBoy.AI server...")
     try:
-        process = subprocess.Popen(
-            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", "8000"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        time.sleep(2)
-        
-        if process.poll() is None:
+        # Server output goes to a log file: undrained pipes would eventually
+        # fill up and block uvicorn on its next write.
+        Path("logs").mkdir(exist_ok=True)
+        if os.name == "nt":
+            spawn = {"creationflags": subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            spawn = {"start_new_session": True}
+        with open("logs/server.log", "ab") as log:
+            process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", "8000"],
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                **spawn
+            )
+        if wait_for_server(process):
             print("[OK] Server started on http://127.0.0.1:8000")
             return process
         else:
@@ -186,13 +252,11 @@ def main():
         input("\nPress Enter to exit...")
         sys.exit(1)
     
-    print("\n" + "=" * 70)
-    print("All checks passed! Ready to launch.")
-    print("=" * 70)
+    print(f"\n{_RULE}\nAll checks passed! Ready to launch.\n{_RULE}")
     
     # Load config to determine startup mode
     try:
-        config = json.loads(Path("data/GoodBoy_config.json").read_text())
+        config = loads(Path("data/GoodBoy_config.json").read_bytes())
         auto_start = config.get("auto_start_server", True)
         engine = config.get("engine", "cloud")
         show_chain_of_thought = config.get("show_chain_of_thought", True)
@@ -220,15 +284,8 @@ def main():
         processes.append(ui_process)
     
     if processes:
-        print("\n" + "=" * 70)
-        print("GoodBoy.AI is running!")
-        print("=" * 70)
-        print("\n💡 Tips:")
-        print("   - Download a model using Tools → Model Manager")
-        print("   - Adjust settings in Tools → Settings")
-        print("   - GoodBoy learns from every conversation")
-        print("\n   Close this window to shut down GoodBoy.AI")
-        print("=" * 70)
+        sys.stdout.write(_RUNNING_NOTICE)
+        sys.stdout.flush()
         
         try:
             # Keep running until UI is closed
@@ -1,21 +1,43 @@
 """Pytest configuration and fixtures."""
+import os
+
 import pytest
-from pathlib import Path
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_environment():
-    """Setup test directories before running tests."""
-    dirs = ["data", "memory", "models", "logs"]
-    for d in dirs:
-        Path(d).mkdir(exist_ok=True)
-    yield
-    # Cleanup can go here if needed
+def setup_test_environment(tmp_path_factory):
+    """Give each test process its own runtime tree before the app is imported.
+    
+    app.config reads GOODBOY_ROOT at import; the cwd is moved there too for
+    the modules that use relative paths. Under ``pytest -n auto`` every
+    worker gets a separate directory, so workers never share data/ or memory/.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    root = tmp_path_factory.mktemp(f"goodboy-{worker}")
+    for d in ["data", "memory", "models", "logs"]:
+        (root / d).mkdir()
+    old_root = os.environ.get("GOODBOY_ROOT")
+    old_cwd = os.getcwd()
+    os.environ["GOODBOY_ROOT"] = str(root)
+    os.chdir(root)
+    yield root
+    os.chdir(old_cwd)
+    if old_root is None:
+        os.environ.pop("GOODBOY_ROOT", None)
+    else:
+        os.environ["GOODBOY_ROOT"] = old_root
 
 
-@pytest.fixture
-def client():
-    """Create FastAPI test client."""
-    from fastapi.testclient import TestClient
+@pytest.fixture(scope="session")
+def app_module():
+    """The FastAPI app, imported once per session."""
     from app.main import app
-    return TestClient(app)
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app_module):
+    """FastAPI test client shared by the session; app startup runs once."""
+    from fastapi.testclient import TestClient
+    with TestClient(app_module) as c:
+        yield c
@@ -28,16 +28,76 @@ def test_config_creation():
     assert "engine" in config
     assert "max_tokens" in config
 
-def test_memory_manager():
+def test_memory_manager(tmp_path):
     """Test memory manager basic operations."""
     from app.memory import MemoryManager
-    from pathlib import Path
-    import tempfile
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        mem = MemoryManager(Path(tmpdir))
-        mem.add_message(user_message="test")
-        assert len(mem.messages) == 1
+    mem = MemoryManager(tmp_path)
+    mem.add_message(user_message="test")
+    assert len(mem.messages) == 1
+
+def test_memory_cleanup_tombstones(tmp_path):
+    """Expired messages are tombstoned and stay gone after reload."""
+    from app.memory import MemoryManager
+    from datetime import datetime, timedelta
+    import json
+    
+    old = (datetime.now() - timedelta(days=60)).isoformat()
+    new = datetime.now().isoformat()
+    rows = [{"timestamp": old, "user": "old", "assistant": None}]
+    rows += [{"timestamp": new, "user": f"new{i}", "assistant": None} for i in range(4)]
+    (tmp_path / "messages.jsonl").write_text("".join(json.dumps(r) + "\n" for r in rows))
+    
+    mem = MemoryManager(tmp_path)
+    mem.cleanup_old_entries(days=30)
+    assert [m["user"] for m in mem.messages] == ["new0", "new1", "new2", "new3"]
+    assert (tmp_path / "tombstones.jsonl").exists()
+    
+    mem.add_message(user_message="new4")
+    reloaded = MemoryManager(tmp_path)
+    assert [m["user"] for m in reloaded.messages] == ["new0", "new1", "new2", "new3", "new4"]
+
+def test_stable_memory_ids():
+    """Memory ids must not depend on the per-process hash seed."""
+    from app.memory_backend import stable_id
+    a = stable_id("api-chat", "hello", "world")
+    assert a == stable_id("api-chat", "hello", "world")
+    assert a.startswith("api-chat-")
+    assert a != stable_id("api-chat", "hello world", "")
+
+def test_relevant_lessons(tmp_path):
+    """Lessons are ranked by shared words, topic/tag matches first."""
+    from app.teachings import TeachingStore
+    
+    store = TeachingStore()
+    store.path = tmp_path / "teachings.jsonl"
+    store.add_lesson("emails", "Always sign emails with Cheers.", ["email"])
+    store.add_lesson("python style", "Use four spaces in code.", [])
+    assert [l.topic for l in store.get_relevant_lessons("python code", k=1)] == ["python style"]
+    store.add_lesson("code review", "Run pytest before pushing python code.", [])
+    assert [l.topic for l in store.get_relevant_lessons("code review", k=2)] == ["code review", "python style"]
+    assert store.get_relevant_lessons("unrelated") == []
+
+def test_user_profile_replay(tmp_path, monkeypatch):
+    """Events logged after the last profile snapshot are replayed on load."""
+    import app.user_profile as user_profile
+    
+    monkeypatch.setattr(user_profile, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(user_profile, "PROFILE_PATH", tmp_path / "user_profile.json")
+    monkeypatch.setattr(user_profile, "EXPERIENCE_LOG_PATH", tmp_path / "experience_log.jsonl")
+    store = user_profile.UserProfileStore()
+    store.SNAPSHOT_EVERY = 2
+    store.LOG_FLUSH_EVERY = 1
+    store.record_chat("hi", "hello")
+    store.record_tool("read_file", True, "ok")
+    store.record_tool("write_file", False, "denied")
+    
+    reloaded = user_profile.UserProfileStore()
+    profile = reloaded.snapshot()
+    assert (profile.chats_total, profile.tools_total, profile.tools_successful) == (1, 2, 1)
+    # Leave nothing for the atexit flush once the paths are restored.
+    store.close()
+    reloaded.close()
 
 def test_council_creation():
     """Test council initialization."""
@@ -49,5 +109,221 @@ def test_council_creation():
     assert "Alfred" in agent_names
     assert "Jarvis" in agent_names
 
+def test_dynamic_tools_not_executable(tmp_path, monkeypatch):
+    """Tools loaded from tools_registry.json are listed but never run."""
+    import json
+    import app.tools as tools
+    
+    registry = tmp_path / "tools_registry.json"
+    registry.write_text(json.dumps({"tools": [
+        {"name": "say_hi", "kind": "subprocess", "command_template": "echo {who}"}
+    ]}))
+    monkeypatch.setattr(tools, "TOOLS_REGISTRY_PATH", registry)
+    monkeypatch.setattr(tools, "TOOL_REGISTRY", dict(tools.TOOL_REGISTRY))
+    monkeypatch.setattr(tools, "_available_cache", None)
+    ran = []
+    monkeypatch.setattr(tools, "run_subprocess", lambda cmd: ran.append(cmd))
+    
+    tools._load_dynamic_tools()
+    assert "say_hi" in tools.list_available()
+    result = tools.execute_tool("say_hi", {"who": "there"})
+    assert not result.ok
+    assert ran == []
+
+def test_dashboards_parse():
+    """Both Gradio dashboards are valid Python, even where gradio is missing."""
+    import ast
+    root = Path(__file__).resolve().parent.parent
+    for rel in ("app/dashboard.py", "ui/dashboard.py"):
+        ast.parse((root / rel).read_bytes(), filename=rel)
+
+def test_ui_dashboard_import():
+    """ui/dashboard.py imports and builds its tail helpers."""
+    pytest.importorskip("gradio")
+    pytest.importorskip("httpx")
+    import importlib.util
+    path = Path(__file__).resolve().parent.parent / "ui" / "dashboard.py"
+    spec = importlib.util.spec_from_file_location("ui_dashboard", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert callable(module.load_jsonl_tail)
+    assert callable(module.run_process_action_queue)
+
+def test_scheduler_due_order_and_pruning(tmp_path):
+    """Due tasks come back earliest first; cancelled/completed ones drop out."""
+    from datetime import datetime, timedelta
+    from app.scheduler import Scheduler
+    
+    sched = Scheduler(tmp_path)
+    now = datetime.now()
+    late = sched.add_task("late", "", now - timedelta(minutes=1))
+    early = sched.add_task("early", "", now - timedelta(minutes=30))
+    middle = sched.add_task("middle", "", now - timedelta(minutes=10))
+    future = sched.add_task("future", "", now + timedelta(hours=1))
+    assert sched.get_due_tasks() == [early, middle, late]
+    
+    sched.cancel_task(early.task_id)
+    sched.complete_task(late.task_id)
+    assert sched.get_due_tasks() == [middle]
+    assert sched.get_pending_tasks() == [middle, future]
+    summary = sched.get_summary()
+    assert (summary["pending"], summary["completed"]) == (2, 1)
+    assert summary["next_due"] == middle.scheduled_time.isoformat()
+    sched.flush()
+
+def test_scheduler_persistence_round_trip(tmp_path):
+    """Times are stored as epoch floats and load back unchanged."""
+    import json
+    from datetime import datetime, timedelta
+    from app.scheduler import Scheduler, TaskStatus
+    
+    sched = Scheduler(tmp_path)
+    task = sched.add_task("report", "weekly report", datetime.now() + timedelta(days=1))
+    done = sched.add_task("done", "", datetime.now() - timedelta(days=1))
+    sched.complete_task(done.task_id)
+    sched.flush()
+    
+    rows = json.loads((tmp_path / "scheduled_tasks.json").read_text())
+    assert all(isinstance(r["scheduled_time"], float) for r in rows)
+    assert all(isinstance(r["created_at"], float) for r in rows)
+    
+    reloaded = Scheduler(tmp_path)
+    by_id = {t.task_id: t for t in reloaded.tasks}
+    assert by_id[task.task_id].scheduled_time == task.scheduled_time
+    assert by_id[done.task_id].status == TaskStatus.COMPLETED
+    assert by_id[done.task_id].completed_at == done.completed_at
+    assert reloaded.get_pending_tasks() == [by_id[task.task_id]]
+
+def test_scheduler_requeues_on_executor_shutdown(tmp_path):
+    """A due task whose handler cannot be submitted goes back to pending."""
+    from datetime import datetime, timedelta
+    from app.scheduler import Scheduler, TaskStatus
+    
+    sched = Scheduler(tmp_path)
+    ran = []
+    sched.register_handler("notify", ran.append)
+    task = sched.add_task("ping", "", datetime.now() - timedelta(minutes=1), callback="notify")
+    
+    class StoppedPool:
+        def submit(self, fn, *args):
+            # stop_scheduler() ran between taking the batch and submitting it.
+            sched._running = False
+            raise RuntimeError("cannot schedule new futures after shutdown")
+    
+    sched._executor = StoppedPool()
+    sched._running = True
+    sched._scheduler_loop()
+    assert ran == []
+    assert task.status == TaskStatus.PENDING
+    assert sched.get_due_tasks() == [task]
+    sched.flush()
+
+def test_scheduler_loads_legacy_iso_file(tmp_path):
+    """Task files written before epoch storage (ISO strings) still load."""
+    import json
+    from datetime import datetime, timedelta
+    from app.scheduler import Scheduler, TaskStatus
+    
+    due = datetime.now() - timedelta(hours=1)
+    created = due - timedelta(days=1)
+    (tmp_path / "scheduled_tasks.json").write_text(json.dumps([{
+        "task_id": "legacy01",
+        "title": "legacy",
+        "description": "from an old file",
+        "scheduled_time": due.isoformat(),
+        "priority": 2,
+        "recurring": None,
+        "callback": None,
+        "status": "pending",
+        "created_at": created.isoformat(),
+        "completed_at": None
+    }]))
+    
+    sched = Scheduler(tmp_path)
+    [task] = sched.get_due_tasks()
+    assert task.task_id == "legacy01"
+    assert task.scheduled_time == due
+    assert task.created_at == created
+    assert task.status == TaskStatus.PENDING
+
+def test_evolution_delta_replay(tmp_path):
+    """Deltas logged after a snapshot replay to the same state on load."""
+    import copy
+    from app.memory_evolution import EvolutionSystem
+    
+    evo = EvolutionSystem(tmp_path)
+    evo.SNAPSHOT_EVERY = 3
+    for i in range(5):
+        evo.record_interaction("msg", "reply", ["Batman"], success=i != 1)
+    # Three went into the snapshot, two are only in the delta log.
+    assert (tmp_path / "evolution.json").exists()
+    expected = copy.deepcopy(evo.evolution_state)
+    evo._delta_handle.close()  # simulate a crash: no closing snapshot
+    
+    reloaded = EvolutionSystem(tmp_path)
+    assert reloaded.evolution_state == expected
+    assert reloaded._dirty_count == 2
+    reloaded.close()
+
+def test_evolution_torn_delta_line(tmp_path):
+    """A truncated last delta line is skipped and does not swallow later ones."""
+    from app.memory_evolution import EvolutionSystem
+    
+    evo = EvolutionSystem(tmp_path)
+    for _ in range(3):
+        evo.record_interaction("msg", "reply", ["Batman"])
+    evo._delta_handle.close()
+    delta_file = tmp_path / "evolution.delta.jsonl"
+    delta_file.write_bytes(delta_file.read_bytes()[:-10])
+    
+    reloaded = EvolutionSystem(tmp_path)
+    assert reloaded.evolution_state["total_interactions"] == 2
+    reloaded.record_interaction("msg", "reply", ["Alfred"])
+    reloaded._delta_handle.close()
+    
+    again = EvolutionSystem(tmp_path)
+    assert again.evolution_state["total_interactions"] == 3
+    assert again.evolution_state["agent_proficiency"]["Alfred"] > 1.0
+    again.close()
+
+def test_tail_lines_cursor(tmp_path):
+    """tail_lines follows appends, holds back a partial line and survives truncation."""
+    from app.json_utils import tail_lines
+    
+    log = tmp_path / "log.jsonl"
+    log.write_bytes(b"".join(b"%d\n" % i for i in range(10)))
+    assert tail_lines(log, 3, log.stat().st_size) == [b"7", b"8", b"9"]
+    
+    with log.open("ab") as f:
+        f.write(b"10\n1")
+    assert tail_lines(log, 3, log.stat().st_size) == [b"9", b"10", b"1"]
+    with log.open("ab") as f:
+        f.write(b"1\n")
+    assert tail_lines(log, 3, log.stat().st_size) == [b"9", b"10", b"11"]
+    
+    log.write_bytes(b"a\nb\n")
+    assert tail_lines(log, 3, log.stat().st_size) == [b"a", b"b"]
+
+def test_tools_prompt_keeps_configured_names():
+    """The planner's tool list is allowed_tools joined as configured."""
+    from app.tools import tools_prompt
+    
+    allowed = ["read_file", "not_a_registered_tool", "list_dir"]
+    assert tools_prompt(allowed) == "read_file, not_a_registered_tool, list_dir"
+    assert tools_prompt([]) == ""
+
+def test_api_gateways_do_not_share_integrations(tmp_path):
+    """register_api on one gateway leaves another over the same file alone."""
+    pytest.importorskip("requests")
+    from app.web_gateway import APIGateway
+    
+    config = tmp_path / "api_integrations.json"
+    config.write_text('{"apis": {}}')
+    first = APIGateway(config)
+    second = APIGateway(config)
+    first.register_api("weather", "https://example.invalid/")
+    assert second.integrations == {"apis": {}}
+    assert "weather" in APIGateway(config).integrations["apis"]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
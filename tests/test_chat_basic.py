@@ -1,12 +1,4 @@
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-
-client = TestClient(app)
-
-
-def test_root():
+def test_root(client):
     r = client.get("/")
     assert r.status_code == 200
     data = r.json()
@@ -15,7 +7,7 @@ def test_root():
     assert isinstance(data.get("agents"), list)
 
 
-def test_agents_endpoint():
+def test_agents_endpoint(client):
     r = client.get("/agents")
     assert r.status_code == 200
     data = r.json()
@@ -23,7 +15,7 @@ def test_agents_endpoint():
     assert any(a["name"] == "writer" for a in data["agents"])
 
 
-def test_chat_basic():
+def test_chat_basic(client):
     r = client.post("/chat", json={"message": "Say hi in one short sentence."})
     assert r.status_code == 200
     data = r.json()
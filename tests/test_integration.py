@@ -1,12 +1,8 @@
 """Integration tests for GoodBoy.AI council system."""
 import pytest
-from pathlib import Path
-
-# Ensure test directories exist
-Path("data").mkdir(exist_ok=True)
-Path("memory").mkdir(exist_ok=True)
-Path("models").mkdir(exist_ok=True)
 
+# The session-scoped ``client`` fixture and the test directories come from
+# conftest.py, so the app starts once for the whole run.
 
 class TestHealthCheck:
     """Test basic health endpoints."""
@@ -44,12 +40,12 @@ class TestChat:
         r = client.post("/chat", json={"message": ""})
         assert r.status_code == 400
 
-    def test_chat_modes(self, client):
-        for mode in ["auto", "reflex", "council", "strategic"]:
-            r = client.post("/chat", json={"message": "Test", "mode": mode})
-            assert r.status_code == 200
-            data = r.json()
-            assert data["route_metadata"]["mode"] == mode
+    @pytest.mark.parametrize("mode", ["auto", "reflex", "council", "strategic"])
+    def test_chat_mode(self, client, mode):
+        r = client.post("/chat", json={"message": "Test", "mode": mode})
+        assert r.status_code == 200
+        data = r.json()
+        assert data["route_metadata"]["mode"] == mode
 
 
 class TestEvolution:
@@ -129,12 +125,3 @@ class TestMinibots:
         data = r.json()
         assert "minibots" in data
         assert "count" in data
-
-
-# Pytest fixtures
-@pytest.fixture
-def client():
-    """Create test client."""
-    from fastapi.testclient import TestClient
-    from app.main import app
-    return TestClient(app)
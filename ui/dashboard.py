@@ -1,114 +1,155 @@
 from __future__ import annotations
 
-import json
-import subprocess
+import asyncio
+import importlib.util
+import io
+import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, Tuple
 
 import gradio as gr
-import httpx
 
-API_BASE = "http://127.0.0.1:8000"
 ROOT = Path(__file__).resolve().parents[1]
+# Started as a script (python ui/dashboard.py), so put the package root on the path.
+sys.path.append(str(ROOT))
+from app.dashboard_common import ACLIENT, render_jsonl_tail, serve  # noqa: E402
+from app.json_utils import loads  # noqa: E402
+
 DATA_DIR = ROOT / "data"
 
+# API paths, relative to ACLIENT's base_url.
+_CHAT_PATH = "/chat"
+_MEMORY_SEARCH_PATH = "/memory/search"
+_JANITOR_PATH = "/janitor/run"
+
+# run_process_action_queue keeps only the end of the script's output.
+QUEUE_OUTPUT_CHARS = 4000
+_QUEUE_MODULE = None
 
-def call_chat(message: str) -> Dict[str, Any]:
-    resp = httpx.post(f"{API_BASE}/chat", json={"message": message}, timeout=120)
+async def call_chat(message: str) -> Dict[str, Any]:
+    resp = await ACLIENT.post(_CHAT_PATH, json={"message": message})
     resp.raise_for_status()
     return resp.json()
 
-ndef load_jsonl_tail(relative: str, limit: int = 20) -> str:
-    path = DATA_DIR / relative
-    if not path.exists():
-        return f"No data yet at {path}"
-    try:
-        lines = path.read_text(encoding="utf-8").splitlines()
-    except Exception as e:
-        return f"Error reading {path}: {e}"
-    tail = lines[-limit:]
-    out: List[str] = []
-    for line in tail:
-        try:
-            obj = json.loads(line)
-            out.append(json.dumps(obj, ensure_ascii=False, indent=2))
-        except Exception:
-            out.append(line)
-    return "\n\n---\n\n".join(out)
-
-ndef run_process_action_queue() -> str:
+
+def load_jsonl_tail(relative: str, limit: int = 20, pretty: bool = True) -> str:
+    return render_jsonl_tail(DATA_DIR / relative, limit, pretty)
+
+
+ADMIN_TAILS = ("overseer_suggestions.jsonl", "self_reflections.jsonl", "processed_actions.jsonl")
+
+
+async def load_all_tails() -> tuple:
+    """Read the three admin tails concurrently, in ADMIN_TAILS order."""
+    return tuple(await asyncio.gather(*(asyncio.to_thread(load_jsonl_tail, name) for name in ADMIN_TAILS)))
+
+
+def _load_queue_module(script: Path):
+    """Import process_action_queue.py once and keep it for later clicks."""
+    global _QUEUE_MODULE
+    if _QUEUE_MODULE is None:
+        spec = importlib.util.spec_from_file_location("process_action_queue", script)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _QUEUE_MODULE = module
+    return _QUEUE_MODULE
+
+
+def run_process_action_queue() -> str:
     """Run the process_action_queue script and return its stdout.
 
-    This assumes the dashboard is running inside the GoodBoy.AI venv.
+    The script is imported and its main() called in-process with its own
+    output buffer (process-wide stdout is never swapped, so concurrent
+    handlers cannot mix output). This assumes the dashboard is running
+    inside the GoodBoy.AI venv.
     """
 
     script = ROOT / "scripts" / "process_action_queue.py"
     if not script.exists():
         return f"process_action_queue.py not found at {script}"
+    buf = io.StringIO()
     try:
-        proc = subprocess.run(
-            ["python", str(script)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            encoding="utf-8",
-        )
-        return proc.stdout[-4000:]
+        _load_queue_module(script).main(out=buf)
+    except SystemExit as e:
+        buf.write(f"process_action_queue.py exited with status {e.code}\n")
     except Exception as e:
         return f"Error running process_action_queue.py: {e}"
+    return buf.getvalue()[-QUEUE_OUTPUT_CHARS:]
+
 
+async def stream_chat(message: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (event, payload) pairs from a streamed /chat.
 
-def call_memory(q: str) -> Dict[str, Any]:
-    r = httpx.get(f"{API_BASE}/memory/search", params={"q": q, "k": 5}, timeout=60)
+    The server sends ``reply`` once the council has answered and ``done``
+    with the suggested actions added.
+    """
+    async with ACLIENT.stream("POST", _CHAT_PATH, json={"message": message, "stream": True}) as resp:
+        resp.raise_for_status()
+        event = None
+        async for line in resp.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: ") and event is not None:
+                yield event, loads(line[6:])
+
+
+async def call_memory(q: str) -> Dict[str, Any]:
+    r = await ACLIENT.get(_MEMORY_SEARCH_PATH, params={"q": q, "k": 5, "max_chars": 200})
     r.raise_for_status()
     return r.json()
 
 
-def call_janitor() -> Dict[str, Any]:
-    r = httpx.post(f"{API_BASE}/janitor/run", timeout=60)
+async def call_janitor() -> Dict[str, Any]:
+    r = await ACLIENT.post(_JANITOR_PATH)
     r.raise_for_status()
     return r.json()
 
 
-def chat_fn(message: str, history: list[list[str]]):
-    if not message.strip():
-        return history, ""
-    data = call_chat(message)
+_TRACE_FMT = "[{agent}] {proposal}".format_map
+
+
+def _format_action(a: Dict[str, Any]) -> str:
+    return f"[{a.get('kind', 'note')}] {a.get('description', '')} (tool={a.get('tool_name') or '-'})"
+
+
+def _render_reply(data: Dict[str, Any], planning: bool = False) -> str:
     output = data.get("output", "")
     trace = data.get("agent_trace", [])
     actions = data.get("suggested_actions", []) or []
-    trace_str = "\n\n".join([f"[{t['agent']}] {t['proposal']}" for t in trace]) if trace else "(no trace)"
-    if actions:
-        acts_lines = []
-        for a in actions:
-            desc = a.get("description", "")
-            kind = a.get("kind", "note")
-            tool = a.get("tool_name") or "-"
-            acts_lines.append(f"[{kind}] {desc} (tool={tool})")
-        actions_str = "\n".join(acts_lines)
+    trace_str = "\n\n".join(map(_TRACE_FMT, trace)) if trace else "(no trace)"
+    if planning:
+        actions_str = "(planning...)"
     else:
-        actions_str = "(no suggested actions)"
-    bot_msg = (
-        f"Bathy: {output}\n\n--- Council trace ---\n{trace_str}"
-        f"\n\n--- Suggested actions ---\n{actions_str}"
-    )
-    history = history + [[f"Lando: {message}", bot_msg]]
-    return history, ""
+        actions_str = "\n".join(map(_format_action, actions)) if actions else "(no suggested actions)"
+    return "".join((
+        "Bathy: ", str(output),
+        "\n\n--- Council trace ---\n", trace_str,
+        "\n\n--- Suggested actions ---\n", actions_str,
+    ))
+
+
+async def chat_fn(message: str, history: list[list[str]]):
+    if not message.strip():
+        yield history, ""
+        return
+    user_msg = f"Lando: {message}"
+    # The reply shows up as soon as the council answers; actions follow.
+    async for event, data in stream_chat(message):
+        yield history + [[user_msg, _render_reply(data, planning=event == "reply")]], ""
 
 
-def memory_fn(query: str):
+async def memory_fn(query: str):
     if not query.strip():
         return ""
-    res = call_memory(query)
+    res = await call_memory(query)
     out = []
     for r in res.get("results", []):
-        out.append(f"- {r.get('text','')[:200]}...")
+        out.append(f"- {r.get('text','')}{'...' if r.get('truncated') else ''}")
     return "\n".join(out)
 
 
-def janitor_fn():
-    rep = call_janitor()
-    return json.dumps(rep, indent=2)
+async def janitor_fn() -> Dict[str, Any]:
+    return await call_janitor()
 
 
 def build_interface() -> gr.Blocks:
@@ -124,7 +165,7 @@ def build_interface() -> gr.Blocks:
             chatbox = gr.Chatbot(label="Lando x Good boy AI", height=400)
             msg = gr.Textbox(label="Your message", placeholder="Ask Bathy to plan, build, or analyze.")
             send = gr.Button("Send", variant="primary")
-            send.click(chat_fn, inputs=[msg, chatbox], outputs=[chatbox, msg])
+            send.click(chat_fn, inputs=[msg, chatbox], outputs=[chatbox, msg], queue=True)
 
         with gr.Tab("Memory Search"):
             q = gr.Textbox(label="Search query")
@@ -134,7 +175,7 @@ def build_interface() -> gr.Blocks:
 
         with gr.Tab("Health / Janitor"):
             btn_j = gr.Button("Run health check")
-            status = gr.Textbox(label="Janitor report", lines=12)
+            status = gr.JSON(label="Janitor report")
             btn_j.click(janitor_fn, inputs=None, outputs=status)
 
         with gr.Tab("Admin / Evolution"):
@@ -162,6 +203,8 @@ def build_interface() -> gr.Blocks:
                 inputs=None,
                 outputs=processed_box,
             )
+            # Fill all three on page load; the buttons above refresh one each.
+            demo.load(load_all_tails, inputs=None, outputs=[overseer_box, reflect_box, processed_box])
 
             gr.Markdown("### Action queue\nRun Bathy's queued suggestions (safe tools only).")
             run_btn = gr.Button("Run action queue processor")
@@ -174,5 +217,4 @@ def build_interface() -> gr.Blocks:
 
 
 if __name__ == "__main__":
-    demo = build_interface()
-    demo.launch() 
+    serve(build_interface())